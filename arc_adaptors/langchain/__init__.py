@@ -3,6 +3,20 @@ LangChain adaptor for ARC Protocol
 """
 
 from .adaptor import ARCLangChainAdaptor
-from .tools import create_arc_handoff_tool, load_arc_handoff_tools
+from .cache import LLMCache, cached_tool
+from .callbacks import HandoffPrefetchHandler
+from .concurrency import AdaptiveSemaphore
+from .llm import get_shared_llm
+from .tools import create_arc_batch_tool, create_arc_handoff_tool, load_arc_handoff_tools
 
-__all__ = ["ARCLangChainAdaptor", "create_arc_handoff_tool", "load_arc_handoff_tools"]
\ No newline at end of file
+__all__ = [
+    "ARCLangChainAdaptor",
+    "AdaptiveSemaphore",
+    "HandoffPrefetchHandler",
+    "LLMCache",
+    "cached_tool",
+    "create_arc_batch_tool",
+    "create_arc_handoff_tool",
+    "get_shared_llm",
+    "load_arc_handoff_tools",
+]
\ No newline at end of file
@@ -6,15 +6,29 @@ with LangChain agents and workflows.
 """
 
 import asyncio
-from typing import Any, Dict, List, Optional, Union
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Union
 
+import httpx
 from langchain_core.tools import BaseTool
 
 from arc import Client as ARCClient
 
 from ..base import BaseAdaptor
+from .cache import LLMCache
+from .concurrency import AdaptiveSemaphore
+from .http import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    arc_tls_config,
+    create_http_client,
+    resolve_hosts,
+    share_http_client,
+)
 from .tools import create_arc_handoff_tool, load_arc_handoff_tools, AgentInfo
 
+logger = logging.getLogger(__name__)
+
 
 class ARCLangChainAdaptor(BaseAdaptor):
     """
@@ -30,7 +44,9 @@ class ARCLangChainAdaptor(BaseAdaptor):
         ledger_url: str,
         agent_ids: List[str],
         token: Optional[str] = None,
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        cache: Optional[LLMCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         """
         Initialize the ARCLangChainAdaptor.
@@ -40,18 +56,57 @@ class ARCLangChainAdaptor(BaseAdaptor):
             ledger_url: URL of the ARC Ledger for retrieving agent information
             agent_ids: List of agent IDs to create tools for
             token: Optional OAuth2 bearer token for authentication
-            config: Optional additional configuration
+            config: Optional additional configuration. The keys
+                `max_connections`, `max_keepalive_connections` and `http2`
+                configure the shared HTTP connection pool, and `cache_ttls`
+                maps agent IDs to the lifetime of their cached responses
+                (by default the cache's `response_ttl`).
+            cache: Optional cache for handoff tool results
+            http_client: Optional HTTP client to send ARC requests through,
+                e.g. one shared with the LLM. Its TLS settings apply to ARC
+                requests, and the adaptor does not close it. If not provided,
+                the adaptor creates its own connection pool with the ARC
+                SDK's TLS setup.
         """
+        config = config or {}
+        
         # Set attributes before calling super().__init__ to avoid validation errors
         self.arc_endpoint = arc_endpoint
         self.ledger_url = ledger_url
         self.agent_ids = agent_ids
         self.token = token
-        self.arc_client = ARCClient(endpoint=arc_endpoint, token=token)
+        self.cache = cache
+        
+        # All ARC requests go through one connection pool
+        self._owns_http_client = http_client is None
+        if http_client is None:
+            pool_options = {
+                key: config[key]
+                for key in ("max_connections", "max_keepalive_connections", "http2")
+                if key in config
+            }
+            # Keep the TLS setup the ARC SDK would use for its own client
+            http_client = create_http_client(verify=arc_tls_config(), **pool_options)
+        self.http_client = http_client
+        self.arc_client = share_http_client(
+            ARCClient(endpoint=arc_endpoint, token=token),
+            self.http_client
+        )
+        self.ledger_client = share_http_client(
+            ARCClient(endpoint=ledger_url),
+            self.http_client
+        )
+        
+        # One adaptive limit per agent so that a slow agent does not starve the others
+        self.semaphores: Dict[str, AdaptiveSemaphore] = {
+            agent_id: AdaptiveSemaphore() for agent_id in agent_ids
+        }
         self.tools: List[BaseTool] = []
+        self._last_warm_up: Optional[float] = None
+        self._ledger_tasks: Set[asyncio.Task] = set()
         
         # Now call super().__init__ with config
-        super().__init__(config or {})
+        super().__init__(config)
     
     def _validate_config(self) -> None:
         """
@@ -181,10 +236,17 @@ class ARCLangChainAdaptor(BaseAdaptor):
         Returns:
             List of LangChain tools for handoff to ARC agents
         """
+        # Resolve the ARC and ledger hosts once instead of on every new connection
+        await self.resolve_hosts()
+        
         self.tools = await load_arc_handoff_tools(
             agent_ids=self.agent_ids,
             ledger_url=self.ledger_url,
-            arc_client=self.arc_client
+            arc_client=self.arc_client,
+            ledger_client=self.ledger_client,
+            cache=self.cache,
+            semaphores=self.semaphores,
+            cache_ttls=self.config.get("cache_ttls")
         )
         return self.tools
     
@@ -212,12 +274,98 @@ class ARCLangChainAdaptor(BaseAdaptor):
         """
         return create_arc_handoff_tool(
             agent_info=agent_info,
-            arc_client=self.arc_client
+            arc_client=self.arc_client,
+            cache=self.cache,
+            semaphore=self.semaphores.get(agent_info.id),
+            cache_ttl=self.config.get("cache_ttls", {}).get(agent_info.id)
         )
     
+    async def resolve_hosts(self) -> Dict[str, str]:
+        """
+        Resolve the hosts of the ARC endpoint and the ledger ahead of the first request.
+        
+        Pooled clients created by the adaptor connect to the cached addresses
+        until they expire. Hosts that cannot be resolved are left to normal DNS.
+        
+        Returns:
+            Mapping of the resolved host names to their addresses
+        """
+        return await resolve_hosts([self.arc_endpoint, self.ledger_url])
+    
+    async def warm_up(self) -> None:
+        """
+        Open a pooled connection to the ARC endpoint ahead of a handoff.
+        
+        Sends an idempotent HEAD request so that the TCP and TLS handshakes are
+        done before the handoff request is sent. Warm-ups within the keep-alive
+        period of the previous one are skipped, and errors are ignored.
+        """
+        now = time.monotonic()
+        if self._last_warm_up is not None and now - self._last_warm_up < DEFAULT_KEEPALIVE_EXPIRY:
+            return
+        self._last_warm_up = now
+        
+        try:
+            await self.http_client.head(self.arc_endpoint)
+        except httpx.HTTPError:
+            # The handoff request will open its own connection
+            self._last_warm_up = None
+    
+    def append_to_ledger(
+        self,
+        messages: List[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> asyncio.Task:
+        """
+        Append messages to the ARC Ledger in the background.
+        
+        The request is not awaited, so callers on the hot path are not delayed;
+        failures are logged. Pending appends are awaited by close().
+        
+        The payload format is provisional until the ARC Ledger defines an
+        append method: the messages are sent as a task.create request with a
+        DataPart holding {"messages": [...]} and metadata {"type": "append"}.
+        
+        Args:
+            messages: ARC messages to append
+            metadata: Optional metadata stored with the messages
+            
+        Returns:
+            The task sending the messages
+        """
+        task = asyncio.ensure_future(self._append_to_ledger(messages, metadata))
+        # Keep a reference so the task is not garbage collected early
+        self._ledger_tasks.add(task)
+        task.add_done_callback(self._ledger_tasks.discard)
+        return task
+    
+    async def _append_to_ledger(
+        self,
+        messages: List[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]]
+    ) -> None:
+        """Send messages to the ARC Ledger, logging failures."""
+        try:
+            await self.ledger_client.task.create(
+                target_agent="ledger",
+                initial_message={
+                    "role": "user",
+                    "parts": [{"type": "DataPart", "content": {"messages": messages}}]
+                },
+                metadata={"type": "append", **(metadata or {})}
+            )
+        except Exception as e:
+            logger.warning("Failed to append messages to the ARC Ledger: %s", e)
+    
     async def close(self):
-        """Close the ARC client and release resources."""
-        await self.arc_client.close()
+        """Close the HTTP client if the adaptor created it and release resources."""
+        # Finish pending ledger appends while the client is still open
+        if self._ledger_tasks:
+            await asyncio.gather(*self._ledger_tasks, return_exceptions=True)
+        
+        # The ARC and ledger clients both send requests through this client
+        if self._owns_http_client:
+            await self.http_client.aclose()
     
     async def __aenter__(self):
         return self
@@ -0,0 +1,402 @@
+"""
+Caching utilities for ARC Protocol LangChain integrations.
+
+This module provides the LLMCache class, a two-level cache that maps prompts
+to agent responses and handoff tool calls to their results, and the
+cached_tool decorator for caching the results of async tool functions.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+# Faster serialization and hashing of cache keys when installed (arc-adaptors[fast])
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+WHITESPACE_RE = re.compile(r"\s+")
+# Tool metadata key holding the lifetime of the tool's cached results
+METADATA_KEY_CACHE_TTL = "__cache_ttl"
+# Custom callback event sent by tools that report a failure as their result
+EVENT_TOOL_FAILED = "arc_tool_failed"
+
+
+def _to_jsonable(obj: Any) -> Any:
+    """Convert objects that json cannot serialize natively (e.g. messages)."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
+
+
+def _dumps(payload: Any) -> bytes:
+    """Serialize a payload to compact JSON with sorted keys."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                payload,
+                default=_to_jsonable,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            # e.g. integers beyond 64 bits, which orjson does not support
+            pass
+    return json.dumps(
+        payload,
+        sort_keys=True,
+        default=_to_jsonable,
+        separators=(",", ":"),
+        ensure_ascii=False
+    ).encode("utf-8")
+
+
+def _hash(data: bytes) -> str:
+    """Return the hex digest of serialized data."""
+    if blake3 is not None:
+        return blake3(data).hexdigest()
+    return hashlib.sha256(data).hexdigest()
+
+
+def _digest(payload: Any) -> str:
+    """Return a stable digest of a JSON-serializable payload."""
+    return _hash(_dumps(payload))
+
+
+def _normalize_value(value: Any, fold_case: bool) -> Any:
+    """Normalize whitespace (and optionally case) of the strings in a value."""
+    if isinstance(value, str):
+        value = WHITESPACE_RE.sub(" ", value.strip())
+        return value.lower() if fold_case else value
+    if isinstance(value, dict):
+        return {key: _normalize_value(item, fold_case) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(item, fold_case) for item in value]
+    return value
+
+
+def canonicalize_args(args: Dict[str, Any], fold_case: bool = False) -> str:
+    """
+    Canonicalize tool arguments so that equivalent calls compare equal.
+
+    Args:
+        args: Arguments passed to the tool
+        fold_case: Whether to lowercase strings. Only enable this for tools
+            whose result does not depend on case.
+
+    Returns:
+        JSON string of the arguments with sorted keys and normalized strings
+    """
+    return _dumps(_normalize_value(args, fold_case)).decode("utf-8")
+
+
+class LLMCache:
+    """
+    Two-level cache for LangChain agents using ARC handoff tools.
+
+    The first level maps a prompt (model, messages, tools and temperature) to
+    the agent's response, short-circuiting the LLM call. The second level maps
+    a handoff tool call (tool name and arguments) to its result, short-circuiting
+    the ARC request. Both levels are bounded (least recently used entries are
+    evicted first) and entries may expire. Only deterministic calls should be
+    cached.
+    """
+
+    def __init__(
+        self,
+        max_tool_results: int = 1024,
+        max_trace: int = 1000,
+        max_responses: int = 1024,
+        response_ttl: Optional[float] = 600.0
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_tool_results: Maximum number of tool results kept
+            max_trace: Maximum number of tool calls kept in the trace
+            max_responses: Maximum number of responses kept
+            response_ttl: Seconds a response stays valid, or None to keep
+                responses until they are evicted
+        """
+        self.max_tool_results = max_tool_results
+        self.max_responses = max_responses
+        self.response_ttl = response_ttl
+        # Cache key -> (response, tokens spent, expiry time or None)
+        self._responses: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        # Tool call key -> (result, expiry time or None)
+        self._tool_results: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        # (tool name, canonical arguments, result, timestamp) of recent tool calls
+        self.tool_trace: Deque[Tuple[str, str, Any, float]] = deque(maxlen=max_trace)
+        self.cache_hits = 0
+        self.tokens_saved = 0
+
+    @staticmethod
+    def cache_key(model: str, messages: List[Any], tools: List[str], temperature: float) -> str:
+        """
+        Build the cache key for a prompt.
+
+        Args:
+            model: Name of the LLM model
+            messages: Messages sent to the model
+            tools: Names of the tools available to the model
+            temperature: Sampling temperature
+
+        Returns:
+            Cache key for the prompt
+        """
+        return _digest({
+            "model": model,
+            "messages": messages,
+            "tools": tools,
+            "temperature": temperature,
+        })
+
+    @staticmethod
+    def tool_key(tool_name: str, args: Dict[str, Any], fold_case: bool = False) -> str:
+        """
+        Build the cache key for a tool call.
+
+        Args:
+            tool_name: Name of the tool
+            args: Arguments passed to the tool
+            fold_case: Whether string arguments are compared case-insensitively
+
+        Returns:
+            Cache key for the tool call
+        """
+        return _hash(tool_name.encode("utf-8") + b"\0" + _dumps(_normalize_value(args, fold_case)))
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key returned by cache_key()
+
+        Returns:
+            The cached response, or None if there is no entry for the key
+        """
+        entry = self._responses.get(key)
+        if entry is None:
+            return None
+
+        value, tokens, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._responses[key]
+            return None
+
+        self._responses.move_to_end(key)
+        self.cache_hits += 1
+        self.tokens_saved += tokens
+        return value
+
+    def set(self, key: str, value: Any, tokens: int = 0, ttl: Optional[float] = None) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key returned by cache_key()
+            value: Response to cache
+            tokens: Number of tokens spent producing the response
+            ttl: Seconds the response stays valid if shorter than
+                `response_ttl`, e.g. the shortest TTL of the tool results
+                it is based on
+        """
+        ttls = [t for t in (ttl, self.response_ttl) if t is not None]
+        expires_at = time.monotonic() + min(ttls) if ttls else None
+        self._responses[key] = (value, tokens, expires_at)
+        self._responses.move_to_end(key)
+
+        while len(self._responses) > self.max_responses:
+            self._responses.popitem(last=False)
+
+    def get_tool_result(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        fold_case: bool = False
+    ) -> Optional[Any]:
+        """
+        Get a cached tool result.
+
+        Args:
+            tool_name: Name of the tool
+            args: Arguments passed to the tool
+            fold_case: Whether string arguments are compared case-insensitively
+
+        Returns:
+            The cached result, or None if the call has not been cached or
+            the entry has expired
+        """
+        key = self.tool_key(tool_name, args, fold_case)
+        entry = self._tool_results.get(key)
+        if entry is None:
+            return None
+
+        result, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._tool_results[key]
+            return None
+
+        self._tool_results.move_to_end(key)
+        self.cache_hits += 1
+        return result
+
+    def set_tool_result(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        result: Any,
+        ttl: Optional[float] = None,
+        fold_case: bool = False
+    ) -> None:
+        """
+        Store a tool result.
+
+        Args:
+            tool_name: Name of the tool
+            args: Arguments passed to the tool
+            result: Result returned by the tool
+            ttl: Seconds after which the result expires, or None to keep it
+                until it is evicted
+            fold_case: Whether string arguments are compared case-insensitively
+        """
+        key = self.tool_key(tool_name, args, fold_case)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._tool_results[key] = (result, expires_at)
+        self._tool_results.move_to_end(key)
+
+        while len(self._tool_results) > self.max_tool_results:
+            self._tool_results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries and reset the counters."""
+        self._responses.clear()
+        self._tool_results.clear()
+        self.tool_trace.clear()
+        self.cache_hits = 0
+        self.tokens_saved = 0
+
+
+def cached_tool(
+    ttl: Optional[float] = None,
+    cache: Optional[LLMCache] = None,
+    name: Optional[str] = None,
+    fold_case: bool = False
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    Cache the results of an async tool function.
+
+    Calls with equivalent arguments within `ttl` seconds return the earlier
+    result instead of running the function again. Calls that raise are not
+    cached. Every call is recorded in the cache's tool trace.
+
+    Args:
+        ttl: Seconds a result stays valid; short for volatile data (e.g. weather),
+            long or None for stable data (e.g. arithmetic)
+        cache: Cache to store the results in. If not provided, the function
+            gets a cache of its own.
+        name: Name of the tool in the cache. Defaults to the function name.
+        fold_case: Whether string arguments are compared case-insensitively
+
+    Returns:
+        A decorator for async tool functions
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        tool_cache = cache if cache is not None else LLMCache()
+        tool_name = name or func.__name__
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            call_args = dict(bound.arguments)
+
+            result = tool_cache.get_tool_result(tool_name, call_args, fold_case)
+            if result is None:
+                result = await func(*args, **kwargs)
+                tool_cache.set_tool_result(tool_name, call_args, result, ttl, fold_case)
+
+            tool_cache.tool_trace.append(
+                (tool_name, canonicalize_args(call_args, fold_case), result, time.time())
+            )
+            return result
+
+        wrapper.cache = tool_cache
+        return wrapper
+
+    return decorator
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """Callback handler that counts the tokens spent by LLM calls."""
+
+    def __init__(self):
+        """Initialize the handler."""
+        super().__init__()
+        self.total_tokens = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        """Add the token usage reported for a finished LLM call."""
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    tokens += usage.get("total_tokens", 0)
+
+        if not tokens and response.llm_output:
+            tokens = response.llm_output.get("token_usage", {}).get("total_tokens", 0)
+
+        self.total_tokens += tokens
+
+
+class ToolTTLHandler(BaseCallbackHandler):
+    """
+    Callback handler that tracks the shortest cache TTL of the tools called
+    and whether any of them failed.
+    """
+
+    def __init__(self):
+        """Initialize the handler."""
+        super().__init__()
+        self.ttl: Optional[float] = None
+        self.failed = False
+
+    def on_tool_start(
+        self,
+        serialized: Dict[str, Any],
+        input_str: str,
+        *,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> None:
+        """Lower the TTL to that of the started tool, if it has one."""
+        ttl = (metadata or {}).get(METADATA_KEY_CACHE_TTL)
+        if ttl is not None and (self.ttl is None or ttl < self.ttl):
+            self.ttl = ttl
+
+    def on_tool_error(self, error: BaseException, **kwargs: Any) -> None:
+        """Record that a tool raised."""
+        self.failed = True
+
+    def on_custom_event(self, name: str, data: Any, **kwargs: Any) -> None:
+        """Record that a tool reported a failure as its result."""
+        if name == EVENT_TOOL_FAILED:
+            self.failed = True
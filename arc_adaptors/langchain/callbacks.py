@@ -0,0 +1,56 @@
+"""
+Callback handlers for ARC Protocol LangChain integrations.
+
+This module provides the HandoffPrefetchHandler class, which warms up the
+connection to the ARC endpoint while the LLM is still generating a handoff
+tool call, so the handoff request does not wait for connection setup.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, List, Optional, Set
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.tools import BaseTool
+
+from .tools import METADATA_KEY_HANDOFF_DESTINATION
+
+if TYPE_CHECKING:
+    from .adaptor import ARCLangChainAdaptor
+
+
+class HandoffPrefetchHandler(AsyncCallbackHandler):
+    """
+    Callback handler that warms up ARC connections during LLM streaming.
+
+    As soon as a streamed chunk names a handoff tool, the handler starts an
+    idempotent warm-up request in the background. The handoff itself is only
+    sent once the tool call is complete.
+    """
+
+    def __init__(self, adaptor: "ARCLangChainAdaptor", tools: List[BaseTool]):
+        """
+        Initialize the HandoffPrefetchHandler.
+
+        Args:
+            adaptor: Adaptor whose connection pool should be warmed up
+            tools: Handoff tools the LLM may call
+        """
+        super().__init__()
+        self.adaptor = adaptor
+        self._handoff_tools: Set[str] = {
+            tool.name
+            for tool in tools
+            if tool.metadata and METADATA_KEY_HANDOFF_DESTINATION in tool.metadata
+        }
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def on_llm_new_token(self, token: str, *, chunk: Optional[Any] = None, **kwargs: Any) -> None:
+        """Start a warm-up when a streamed chunk names a handoff tool."""
+        message = getattr(chunk, "message", None)
+        for tool_call_chunk in getattr(message, "tool_call_chunks", None) or []:
+            if tool_call_chunk.get("name") in self._handoff_tools:
+                task = asyncio.ensure_future(self.adaptor.warm_up())
+                # Keep a reference so the task is not garbage collected early
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                return
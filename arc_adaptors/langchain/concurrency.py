@@ -0,0 +1,156 @@
+"""
+Adaptive concurrency control for ARC Protocol handoffs.
+
+This module provides the AdaptiveSemaphore class, which limits the number of
+requests in flight to an ARC agent and adapts the limit to the agent's
+capacity using additive-increase/multiplicative-decrease (AIMD).
+"""
+
+import asyncio
+import re
+from collections import deque
+from typing import Deque, Optional
+
+from arc.exceptions import (
+    AgentNotAvailableError,
+    AgentTimeoutError,
+    AgentUnreachableError,
+    ARCException,
+    InternalError,
+    NetworkError,
+    RateLimitExceededError,
+    TaskTimeoutError,
+)
+
+# Error code of the exception raised by the ARC client on HTTP 429
+RATE_LIMIT_ERROR_CODE = "-44007"
+HTTP_SERVER_ERROR_RE = re.compile(r"^HTTP error 5\d\d")
+
+
+def is_backpressure_error(error: BaseException) -> bool:
+    """
+    Check whether an error signals that the downstream agent is overloaded.
+
+    Rate limiting (HTTP 429), server errors (HTTP 5xx), timeouts and
+    unavailable agents count as backpressure; client errors do not.
+
+    Args:
+        error: Exception raised by an ARC request
+
+    Returns:
+        True if the error signals backpressure
+    """
+    if isinstance(error, (
+        RateLimitExceededError,
+        InternalError,
+        NetworkError,
+        AgentNotAvailableError,
+        AgentUnreachableError,
+        AgentTimeoutError,
+        TaskTimeoutError,
+        asyncio.TimeoutError,
+        TimeoutError,
+    )):
+        return True
+
+    if isinstance(error, ARCException):
+        return (
+            error.error_code == RATE_LIMIT_ERROR_CODE
+            or bool(HTTP_SERVER_ERROR_RE.match(str(error)))
+        )
+
+    return False
+
+
+class AdaptiveSemaphore:
+    """
+    Semaphore whose limit adapts to downstream backpressure.
+
+    The limit grows by one for every successful request whose round-trip time
+    is not significantly above the moving average, and is multiplied by
+    `decrease_factor` whenever a request fails with backpressure.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 512,
+        decrease_factor: float = 0.5,
+        rtt_smoothing: float = 0.2,
+        rtt_threshold: float = 1.5
+    ):
+        """
+        Initialize the AdaptiveSemaphore.
+
+        Args:
+            initial_limit: Initial number of concurrent requests allowed
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            decrease_factor: Factor applied to the limit on backpressure
+            rtt_smoothing: Weight of the latest sample in the RTT moving average
+            rtt_threshold: Ratio to the RTT moving average above which a
+                successful request does not increase the limit
+        """
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.rtt_smoothing = rtt_smoothing
+        self.rtt_threshold = rtt_threshold
+        self.inflight = 0
+        self.rtt: Optional[float] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        if not self._waiters and self.inflight < int(self.limit):
+            self.inflight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation
+                self.inflight -= 1
+                self._wake_waiters()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self, success: bool = True, rtt: Optional[float] = None) -> None:
+        """
+        Release a slot and adjust the limit.
+
+        Args:
+            success: False if the request failed with backpressure
+            rtt: Round-trip time of the request in seconds. When omitted
+                on success, the limit is left unchanged.
+        """
+        self.inflight -= 1
+
+        if not success:
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        elif rtt is not None:
+            if self.rtt is None or rtt <= self.rtt * self.rtt_threshold:
+                self.limit = min(self.max_limit, self.limit + 1)
+            if self.rtt is None:
+                self.rtt = rtt
+            else:
+                self.rtt += self.rtt_smoothing * (rtt - self.rtt)
+
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Hand free slots to waiting requests."""
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
@@ -0,0 +1,417 @@
+"""
+HTTP utilities for ARC Protocol LangChain integrations.
+
+This module provides a pooled httpx client that is shared by all ARC clients
+created by an adaptor, so handoffs reuse open connections instead of paying
+for a new TCP and TLS handshake on every request. New connections look up
+their host in a short-lived DNS cache instead of resolving it every time.
+"""
+
+import asyncio
+import functools
+import ipaddress
+import logging
+import socket
+import ssl
+import time
+from typing import Any, Dict, Iterable, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+
+from arc import Client as ARCClient
+
+try:
+    import h2  # noqa: F401
+    _HAS_H2 = True
+except ImportError:
+    _HAS_H2 = False
+
+try:
+    from arc.crypto import create_quantum_safe_context
+except ImportError:
+    create_quantum_safe_context = None
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the shared connection pool; tune max_connections to the
+# capacity of the downstream agents
+DEFAULT_MAX_CONNECTIONS = 512
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 128
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+DEFAULT_DNS_TTL = 60.0
+
+
+class DNSCache:
+    """
+    Cache of resolved host addresses.
+
+    Entries expire after `ttl` seconds, after which the host is resolved
+    again so that DNS failover is picked up.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_DNS_TTL):
+        """
+        Initialize an empty DNS cache.
+
+        Args:
+            ttl: Seconds a resolved address is reused
+        """
+        self.ttl = ttl
+        # (host, port) -> (address, expiry time)
+        self._addresses: Dict[Tuple[str, int], Tuple[str, float]] = {}
+
+    def get(self, host: str, port: int) -> Optional[str]:
+        """
+        Get the cached address of a host.
+
+        Args:
+            host: Host name
+            port: Port number
+
+        Returns:
+            The cached address, or None if the host has not been resolved
+            or the entry has expired
+        """
+        entry = self._addresses.get((host, port))
+        if entry is None:
+            return None
+
+        address, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._addresses[(host, port)]
+            return None
+        return address
+
+    async def resolve(self, host: str, port: int) -> str:
+        """
+        Resolve a host and cache its address.
+
+        IPv4 addresses are preferred over IPv6 ones.
+
+        Args:
+            host: Host name
+            port: Port number
+
+        Returns:
+            The resolved address
+
+        Raises:
+            OSError: If the host cannot be resolved
+        """
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        if not infos:
+            raise OSError(f"No addresses found for {host}")
+
+        _, _, _, _, sockaddr = next(
+            (info for info in infos if info[0] == socket.AF_INET),
+            infos[0]
+        )
+        address = sockaddr[0]
+        self._addresses[(host, port)] = (address, time.monotonic() + self.ttl)
+        return address
+
+    def invalidate(self, host: str, port: int) -> None:
+        """
+        Remove the cached address of a host.
+
+        Args:
+            host: Host name
+            port: Port number
+        """
+        self._addresses.pop((host, port), None)
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that connects to hosts through a DNS cache.
+
+    Only the TCP connection goes to the cached address; the TLS handshake
+    still uses the host name, so SNI and certificate checks are unaffected.
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, dns_cache: DNSCache):
+        """
+        Initialize the CachingNetworkBackend.
+
+        Args:
+            backend: Backend that opens the connections
+            dns_cache: Cache to look up host addresses in
+        """
+        self._backend = backend
+        self.dns_cache = dns_cache
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None
+    ) -> httpcore.AsyncNetworkStream:
+        """Open a TCP connection to the cached address of a host."""
+        if _is_ip_address(host):
+            address = host
+        else:
+            address = self.dns_cache.get(host, port)
+            if address is None:
+                try:
+                    address = await self.dns_cache.resolve(host, port)
+                except OSError:
+                    # Let the backend resolve the host itself
+                    address = host
+
+        try:
+            return await self._backend.connect_tcp(
+                address, port, timeout, local_address, socket_options
+            )
+        except httpcore.ConnectError:
+            if address == host:
+                raise
+            # The cached address may be stale; fall back to normal DNS
+            self.dns_cache.invalidate(host, port)
+            return await self._backend.connect_tcp(
+                host, port, timeout, local_address, socket_options
+            )
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[Any]] = None
+    ) -> httpcore.AsyncNetworkStream:
+        """Open a Unix socket connection."""
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        """Sleep for the given number of seconds."""
+        await self._backend.sleep(seconds)
+
+
+def _is_ip_address(host: str) -> bool:
+    """Check whether a host is an IP address literal."""
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def get_dns_cache() -> DNSCache:
+    """
+    Get the process-wide DNS cache used by pooled HTTP clients.
+
+    Returns:
+        The shared DNSCache
+    """
+    return DNSCache()
+
+
+async def resolve_hosts(urls: Iterable[str], dns_cache: Optional[DNSCache] = None) -> Dict[str, str]:
+    """
+    Resolve the hosts of URLs ahead of the first request.
+
+    Hosts that cannot be resolved are skipped; connections to them resolve
+    the host normally.
+
+    Args:
+        urls: URLs whose hosts should be resolved
+        dns_cache: Cache to store the addresses in. Defaults to the shared cache.
+
+    Returns:
+        Mapping of the resolved host names to their addresses
+    """
+    dns_cache = dns_cache or get_dns_cache()
+
+    hosts = set()
+    for url in urls:
+        parts = urlsplit(url)
+        if parts.hostname and not _is_ip_address(parts.hostname):
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            hosts.add((parts.hostname, port))
+    hosts = sorted(hosts)
+
+    results = await asyncio.gather(
+        *[dns_cache.resolve(host, port) for host, port in hosts],
+        return_exceptions=True
+    )
+    return {
+        host: address
+        for (host, _), address in zip(hosts, results)
+        if isinstance(address, str)
+    }
+
+
+def _install_network_backend(transport: httpx.AsyncHTTPTransport, dns_cache: DNSCache) -> None:
+    """
+    Make a transport open its connections through a DNS cache.
+
+    httpx does not expose the network backend of its transports, so the
+    backend of the underlying httpcore pool is replaced. If a future httpx
+    or httpcore release moves it, the transport keeps resolving every
+    connection itself.
+
+    Args:
+        transport: Transport to install the backend on
+        dns_cache: Cache to look up host addresses in
+    """
+    pool = getattr(transport, "_pool", None)
+    backend = getattr(pool, "_network_backend", None)
+    if backend is None:
+        logger.warning("Cannot install the DNS cache: the httpx transport has no network backend")
+        return
+    pool._network_backend = CachingNetworkBackend(backend, dns_cache)
+
+
+def create_http_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    timeout: Union[float, httpx.Timeout] = DEFAULT_TIMEOUT,
+    http2: Optional[bool] = None,
+    dns_cache: Optional[DNSCache] = None,
+    verify: Union[bool, str, ssl.SSLContext] = True,
+    retries: int = 0,
+    **kwargs: Any
+) -> httpx.AsyncClient:
+    """
+    Create a pooled HTTP client for ARC requests.
+
+    Args:
+        max_connections: Maximum number of concurrent connections
+        max_keepalive_connections: Maximum number of idle connections kept open
+        keepalive_expiry: Seconds an idle connection is kept open
+        timeout: Default request timeout
+        http2: Whether to enable HTTP/2. Defaults to True when the `h2`
+            package is installed.
+        dns_cache: Cache of host addresses for new connections. Defaults
+            to the shared cache.
+        verify: TLS verification setting or SSL context, e.g. the one
+            returned by arc_tls_config()
+        retries: Number of times a failed connection attempt is retried
+        **kwargs: Additional arguments for httpx.AsyncClient
+
+    Returns:
+        A pooled httpx.AsyncClient
+    """
+    if http2 is None:
+        http2 = _HAS_H2
+
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        http2=http2,
+        verify=verify,
+        retries=retries
+    )
+    _install_network_backend(transport, dns_cache or get_dns_cache())
+
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=timeout,
+        follow_redirects=True,
+        **kwargs
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_async_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled async HTTP client.
+
+    The client is created on first use and must only be used from one
+    event loop.
+
+    Returns:
+        The shared httpx.AsyncClient
+    """
+    return create_http_client()
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_sync_client() -> httpx.Client:
+    """
+    Get the process-wide pooled sync HTTP client.
+
+    Returns:
+        The shared httpx.Client
+    """
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY
+        ),
+        timeout=DEFAULT_TIMEOUT,
+        follow_redirects=True
+    )
+
+
+def arc_tls_config(verify_ssl: bool = True) -> Union[bool, ssl.SSLContext]:
+    """
+    Get the TLS setting ARC clients use by default.
+
+    Like the ARC SDK, this prefers post-quantum hybrid TLS and falls back to
+    standard TLS when it is not available.
+
+    Args:
+        verify_ssl: Whether to verify server certificates
+
+    Returns:
+        An SSL context, or the verification flag for standard TLS
+    """
+    if create_quantum_safe_context is None:
+        return verify_ssl
+    try:
+        return create_quantum_safe_context(verify_ssl=verify_ssl)
+    except Exception:
+        return verify_ssl
+
+
+# Closing clients replaced by share_http_client(), kept alive until done
+_closing: Set["asyncio.Future[None]"] = set()
+
+
+def _close_client(client: httpx.AsyncClient) -> None:
+    """Close an async HTTP client from synchronous code."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(client.aclose())
+        return
+
+    task = loop.create_task(client.aclose())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def share_http_client(arc_client: ARCClient, http_client: httpx.AsyncClient) -> ARCClient:
+    """
+    Make an ARC client send its requests through a shared HTTP client.
+
+    The client the ARC client created for itself is closed. The shared
+    client's TLS settings apply to the ARC requests.
+
+    Args:
+        arc_client: ARC client to configure
+        http_client: Pooled HTTP client to use
+
+    Returns:
+        The configured ARC client
+    """
+    replaced = arc_client.http_client
+    arc_client.http_client = http_client
+    if replaced is not http_client and isinstance(replaced, httpx.AsyncClient) and not replaced.is_closed:
+        _close_client(replaced)
+    # ARC clients pass their timeout with every request, which would
+    # override the pool's timeout
+    arc_client.timeout = http_client.timeout
+    return arc_client
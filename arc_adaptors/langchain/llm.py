@@ -0,0 +1,60 @@
+"""
+Shared LLM instances for ARC Protocol LangChain integrations.
+
+This module provides get_shared_llm, which returns one ChatOpenAI instance
+per model and temperature for the whole process, so that all agents reuse
+the same pooled connections to the OpenAI API. The instances are bound to
+a single event loop.
+"""
+
+import functools
+from typing import TYPE_CHECKING, Optional
+
+from .http import get_shared_async_client, get_shared_sync_client
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_llm(model: str, temperature: Optional[float] = None) -> "ChatOpenAI":
+    """
+    Get the shared ChatOpenAI instance for a model.
+    
+    The instance is created once per process and uses the shared async HTTP
+    client, whose connections belong to the first event loop that uses them.
+    Only use it from one event loop: after that loop is closed (e.g. by a
+    second asyncio.run(), a new pytest-asyncio loop or
+    ARCLangChainAdaptor.get_tools()), create a separate ChatOpenAI instead.
+    
+    Args:
+        model: Name of the OpenAI model
+        temperature: Optional sampling temperature. If not provided, the
+            model's default temperature is used.
+        
+    Returns:
+        A streaming ChatOpenAI instance using the shared HTTP clients
+        
+    Raises:
+        ImportError: If langchain-openai is not installed
+    """
+    try:
+        from langchain_openai import ChatOpenAI
+    except ImportError as e:
+        raise ImportError(
+            "get_shared_llm requires langchain-openai. "
+            "Install with: pip install langchain-openai"
+        ) from e
+    
+    kwargs = {} if temperature is None else {"temperature": temperature}
+    
+    return ChatOpenAI(
+        model=model,
+        http_client=get_shared_sync_client(),
+        http_async_client=get_shared_async_client(),
+        max_retries=2,
+        request_timeout=20,
+        streaming=True,
+        stream_usage=True,
+        **kwargs
+    )
\ No newline at end of file
@@ -6,15 +6,20 @@ between LangChain agents and ARC Protocol agents.
 
 import asyncio
 import re
+import time
 import uuid
 from typing import Any, Dict, List, Optional, Union, cast
 
+from langchain_core.callbacks import AsyncCallbackManager
 from langchain_core.tools import BaseTool, StructuredTool
 from pydantic import BaseModel, Field
 
 from arc import Client as ARCClient
 from arc.models import Message, Part, Role, TaskObject, TaskStatus
 
+from .cache import EVENT_TOOL_FAILED, METADATA_KEY_CACHE_TTL, LLMCache, cached_tool
+from .concurrency import AdaptiveSemaphore, is_backpressure_error
+
 # Constants
 WHITESPACE_RE = re.compile(r"\s+")
 METADATA_KEY_HANDOFF_DESTINATION = "__handoff_destination"
@@ -26,6 +31,10 @@ def _normalize_agent_name(agent_name: str) -> str:
     return WHITESPACE_RE.sub("_", agent_name.strip()).lower()
 
 
+class _HandoffFailure(Exception):
+    """Raised when a handoff does not produce a response from the agent."""
+
+
 class AgentInfo(BaseModel):
     """Information about an ARC agent."""
     
@@ -49,6 +58,9 @@ def create_arc_handoff_tool(
     arc_client: ARCClient,
     name: Optional[str] = None,
     description: Optional[str] = None,
+    cache: Optional[LLMCache] = None,
+    semaphore: Optional[AdaptiveSemaphore] = None,
+    cache_ttl: Optional[float] = None,
 ) -> BaseTool:
     """Create a tool that can handoff control to an ARC Protocol agent.
     
@@ -59,6 +71,13 @@ def create_arc_handoff_tool(
             If not provided, the tool name will be `transfer_to_<agent_name>`.
         description: Optional description for the handoff tool.
             If not provided, the description will be `Ask agent <agent_name> for help`.
+        cache: Optional cache consulted before sending the request to the agent.
+            Only completed task responses are cached.
+        semaphore: Optional semaphore limiting concurrent requests to the agent.
+        cache_ttl: Seconds a cached response stays valid. Defaults to the
+            cache's `response_ttl`, which keeps responses until they are
+            evicted when set to None. Use a short TTL for agents serving
+            volatile data.
             
     Returns:
         A LangChain tool that handles handoff to the ARC agent
@@ -69,83 +88,141 @@ def create_arc_handoff_tool(
     if description is None:
         description = f"Ask agent '{agent_info.name}' for help"
     
-    async def _handoff_to_agent(message: str) -> str:
-        """Handle the handoff to an ARC agent.
+    async def _send(method: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Send an ARC request, holding a slot of the semaphore if one is set."""
+        if semaphore is None:
+            return await method(**kwargs)
+        
+        await semaphore.acquire()
+        start = time.monotonic()
+        try:
+            response = await method(**kwargs)
+        except BaseException as e:
+            if is_backpressure_error(e):
+                semaphore.release(success=False)
+            else:
+                semaphore.release()
+            raise
+        semaphore.release(success=True, rtt=time.monotonic() - start)
+        return response
+    
+    async def _run_task(message: str) -> str:
+        """Create a task with the ARC agent and wait for its response.
         
         Args:
             message: Message to send to the target agent
             
         Returns:
             Response from the target agent
+            
+        Raises:
+            _HandoffFailure: If the task does not complete with a response
         """
-        try:
-            # Create a message for the ARC Protocol
-            arc_message = {
-                "role": "user",
-                "parts": [{"type": "TextPart", "content": message}]
-            }
+        # Create a message for the ARC Protocol
+        arc_message = {
+            "role": "user",
+            "parts": [{"type": "TextPart", "content": message}]
+        }
+        
+        # Create a task with the target agent
+        response = await _send(
+            arc_client.task.create,
+            target_agent=agent_info.id,
+            initial_message=arc_message
+        )
+        
+        # Get the task ID from the response
+        task_result = response.get("result", {})
+        if not task_result or task_result.get("type") != "task":
+            raise _HandoffFailure(f"Error: Unexpected response format from agent {agent_info.name}")
+            
+        task = task_result.get("task", {})
+        task_id = task.get("taskId")
+        
+        if not task_id:
+            raise _HandoffFailure(f"Error: Failed to create task with agent {agent_info.name}")
+        
+        # Wait for the task to complete
+        max_attempts = 10
+        attempt = 0
+        task_status = task.get("status", "SUBMITTED")
+        
+        while task_status not in ["COMPLETED", "FAILED", "CANCELED"] and attempt < max_attempts:
+            await asyncio.sleep(1)  # Wait before checking status
+            attempt += 1
             
-            # Create a task with the target agent
-            response = await arc_client.task.create(
+            # Get task status
+            info_response = await _send(
+                arc_client.task.info,
                 target_agent=agent_info.id,
-                initial_message=arc_message
+                task_id=task_id
             )
             
-            # Get the task ID from the response
-            task_result = response.get("result", {})
-            if not task_result or task_result.get("type") != "task":
-                return f"Error: Unexpected response format from agent {agent_info.name}"
-                
-            task = task_result.get("task", {})
-            task_id = task.get("taskId")
-            
-            if not task_id:
-                return f"Error: Failed to create task with agent {agent_info.name}"
-            
-            # Wait for the task to complete
-            max_attempts = 10
-            attempt = 0
-            task_status = task.get("status", "SUBMITTED")
+            task_info = info_response.get("result", {}).get("task", {})
+            task_status = task_info.get("status", task_status)
             
-            while task_status not in ["COMPLETED", "FAILED", "CANCELED"] and attempt < max_attempts:
-                await asyncio.sleep(1)  # Wait before checking status
-                attempt += 1
-                
-                # Get task status
-                info_response = await arc_client.task.info(
-                    target_agent=agent_info.id,
-                    task_id=task_id
-                )
-                
-                task_info = info_response.get("result", {}).get("task", {})
-                task_status = task_info.get("status", task_status)
+            if task_status == "COMPLETED":
+                # Get the last message from the agent
+                messages = task_info.get("messages", [])
+                if messages:
+                    agent_messages = [m for m in messages if m.get("role") == "agent"]
+                    if agent_messages:
+                        last_message = agent_messages[-1]
+                        parts = last_message.get("parts", [])
+                        content_parts = [p.get("content", "") for p in parts if p.get("type") == "TextPart"]
+                        return " ".join(content_parts)
                 
-                if task_status == "COMPLETED":
-                    # Get the last message from the agent
-                    messages = task_info.get("messages", [])
-                    if messages:
-                        agent_messages = [m for m in messages if m.get("role") == "agent"]
-                        if agent_messages:
-                            last_message = agent_messages[-1]
-                            parts = last_message.get("parts", [])
-                            content_parts = [p.get("content", "") for p in parts if p.get("type") == "TextPart"]
-                            return " ".join(content_parts)
-                    
-                    return f"Task completed by {agent_info.name}, but no response message was found."
-                
-                elif task_status == "FAILED":
-                    return f"Task failed: {task_info.get('reason', 'Unknown error')}"
-                
-                elif task_status == "CANCELED":
-                    return f"Task was canceled: {task_info.get('reason', 'No reason provided')}"
+                raise _HandoffFailure(f"Task completed by {agent_info.name}, but no response message was found.")
             
-            if attempt >= max_attempts:
-                return f"Timeout waiting for response from {agent_info.name}"
+            elif task_status == "FAILED":
+                raise _HandoffFailure(f"Task failed: {task_info.get('reason', 'Unknown error')}")
             
-            return f"Unexpected error communicating with {agent_info.name}"
+            elif task_status == "CANCELED":
+                raise _HandoffFailure(f"Task was canceled: {task_info.get('reason', 'No reason provided')}")
+        
+        if attempt >= max_attempts:
+            raise _HandoffFailure(f"Timeout waiting for response from {agent_info.name}")
+        
+        raise _HandoffFailure(f"Unexpected error communicating with {agent_info.name}")
+    
+    metadata = {METADATA_KEY_HANDOFF_DESTINATION: agent_info.id}
+    if cache is not None:
+        if cache_ttl is None:
+            # Keeping a remote agent's answers until eviction must be opted into
+            # through the cache's response_ttl
+            cache_ttl = cache.response_ttl
+        # Failed handoffs raise, so only completed responses are cached
+        _run_task = cached_tool(ttl=cache_ttl, cache=cache, name=name)(_run_task)
+        if cache_ttl is not None:
+            # Responses built from this tool's results must not outlive them
+            metadata[METADATA_KEY_CACHE_TTL] = cache_ttl
+    
+    async def _handoff_to_agent(message: str, callbacks: Optional[AsyncCallbackManager] = None) -> str:
+        """Handle the handoff to an ARC agent.
+        
+        Args:
+            message: Message to send to the target agent
+            callbacks: Callback manager of the tool run, passed by LangChain
             
+        Returns:
+            Response from the target agent, or a description of the failure
+        """
+        try:
+            return await _run_task(message)
+        except _HandoffFailure as e:
+            error = str(e)
         except Exception as e:
-            return f"Error during handoff to {agent_info.name}: {str(e)}"
+            error = f"Error during handoff to {agent_info.name}: {str(e)}"
+        
+        # The failure is returned to the LLM as text, so tell the callbacks
+        # that responses built from it must not be cached
+        if callbacks is not None:
+            await callbacks.on_custom_event(
+                EVENT_TOOL_FAILED,
+                {"tool": name, "error": error},
+                run_id=callbacks.parent_run_id
+            )
+        return error
     
     return StructuredTool(
         name=name,
@@ -154,7 +231,90 @@ def create_arc_handoff_tool(
         func=lambda **kwargs: asyncio.run(_handoff_to_agent(kwargs.get("message", ""))),
         coroutine=_handoff_to_agent,
         return_direct=False,
-        metadata={METADATA_KEY_HANDOFF_DESTINATION: agent_info.id}
+        metadata=metadata
+    )
+
+
+class ToolInvocation(BaseModel):
+    """A single tool call inside a batch invocation."""
+
+    tool_name: str = Field(..., description="Name of the tool to invoke")
+    args: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Arguments to pass to the tool"
+    )
+
+
+class BatchToolParams(BaseModel):
+    """Parameters for the batch tool."""
+
+    invocations: List[ToolInvocation] = Field(
+        ...,
+        description="Independent tool calls to run in parallel"
+    )
+
+
+def create_arc_batch_tool(
+    tools: List[BaseTool],
+    name: str = "batch",
+    description: Optional[str] = None,
+) -> BaseTool:
+    """Create a meta-tool that runs several independent tool calls concurrently.
+
+    Models that do not emit parallel tool calls natively can use this tool to
+    fan out to multiple agents in a single step.
+
+    Args:
+        tools: Tools that may be invoked through the batch tool
+        name: Name of the batch tool
+        description: Optional description for the batch tool.
+            If not provided, the description lists the tools that can be batched.
+
+    Returns:
+        A LangChain tool that invokes the given tools concurrently
+    """
+    tools_by_name = {tool.name: tool for tool in tools}
+
+    if description is None:
+        description = (
+            "Run several independent tool calls at the same time. "
+            f"Available tools: {', '.join(tools_by_name)}"
+        )
+
+    async def _invoke(invocation: ToolInvocation) -> str:
+        tool = tools_by_name.get(invocation.tool_name)
+        if tool is None:
+            return f"Error: Unknown tool {invocation.tool_name}"
+        try:
+            return str(await tool.ainvoke(invocation.args))
+        except Exception as e:
+            return f"Error invoking {invocation.tool_name}: {str(e)}"
+
+    async def _run_batch(invocations: List[Any]) -> str:
+        """Run the invocations concurrently.
+
+        Args:
+            invocations: Tool invocations to run
+
+        Returns:
+            The output of each invocation, one per line
+        """
+        invocations = [
+            i if isinstance(i, ToolInvocation) else ToolInvocation(**i)
+            for i in invocations
+        ]
+        results = await asyncio.gather(*[_invoke(i) for i in invocations])
+        return "\n".join(
+            f"{i.tool_name}: {result}" for i, result in zip(invocations, results)
+        )
+
+    return StructuredTool(
+        name=name,
+        description=description,
+        args_schema=BatchToolParams,
+        func=lambda **kwargs: asyncio.run(_run_batch(kwargs.get("invocations", []))),
+        coroutine=_run_batch,
+        return_direct=False,
     )
 
 
@@ -162,6 +322,10 @@ async def load_arc_handoff_tools(
     agent_ids: List[str],
     ledger_url: str,
     arc_client: ARCClient,
+    cache: Optional[LLMCache] = None,
+    ledger_client: Optional[ARCClient] = None,
+    semaphores: Optional[Dict[str, AdaptiveSemaphore]] = None,
+    cache_ttls: Optional[Dict[str, float]] = None,
 ) -> List[BaseTool]:
     """Load handoff tools for ARC Protocol agents.
     
@@ -169,56 +333,81 @@ async def load_arc_handoff_tools(
         agent_ids: List of agent IDs to create tools for
         ledger_url: URL of the ARC Ledger for retrieving agent information
         arc_client: ARC client for communication
+        cache: Optional cache shared by the handoff tools
+        ledger_client: Optional ARC client for the ledger. If not provided,
+            a temporary client is created for the lookups.
+        semaphores: Optional mapping of agent IDs to the semaphores limiting
+            concurrent requests to each agent
+        cache_ttls: Optional mapping of agent IDs to the number of seconds
+            their cached responses stay valid. Agents without an entry use
+            the cache's `response_ttl`.
         
     Returns:
         List of LangChain tools for handoff to ARC agents
     """
+    if ledger_client is None:
+        # Create a temporary client to fetch agent information
+        async with ARCClient(endpoint=ledger_url) as ledger_client:
+            return await load_arc_handoff_tools(
+                agent_ids=agent_ids,
+                ledger_url=ledger_url,
+                arc_client=arc_client,
+                cache=cache,
+                ledger_client=ledger_client,
+                semaphores=semaphores,
+                cache_ttls=cache_ttls
+            )
+    
     tools = []
     
-    # Create a temporary client to fetch agent information
-    async with ARCClient(endpoint=ledger_url) as ledger_client:
-        for agent_id in agent_ids:
-            try:
-                # Fetch agent information from the ledger
-                response = await ledger_client.task.create(
-                    target_agent="ledger",
-                    initial_message={
-                        "role": "user",
-                        "parts": [{"type": "TextPart", "content": f"Get agent info for {agent_id}"}]
-                    },
-                    metadata={"agent_id": agent_id}
-                )
-                
-                # Extract agent information from the response
-                result = response.get("result", {})
-                if result and result.get("type") == "task":
-                    task = result.get("task", {})
-                    artifacts = task.get("artifacts", [])
-                    
-                    # Find the agent info artifact
-                    for artifact in artifacts:
-                        parts = artifact.get("parts", [])
-                        for part in parts:
-                            if part.get("type") == "DataPart":
-                                agent_data = part.get("content", {})
-                                if agent_data and isinstance(agent_data, dict):
-                                    # Create agent info object
-                                    agent_info = AgentInfo(
-                                        id=agent_id,
-                                        name=agent_data.get("name", agent_id),
-                                        url=agent_data.get("url", ""),
-                                        description=agent_data.get("description", "")
-                                    )
-                                    
-                                    # Create and add the handoff tool
-                                    tool = create_arc_handoff_tool(agent_info, arc_client)
-                                    tools.append(tool)
-                                    break
+    for agent_id in agent_ids:
+        try:
+            # Fetch agent information from the ledger
+            response = await ledger_client.task.create(
+                target_agent="ledger",
+                initial_message={
+                    "role": "user",
+                    "parts": [{"type": "TextPart", "content": f"Get agent info for {agent_id}"}]
+                },
+                metadata={"agent_id": agent_id}
+            )
             
-            except Exception as e:
-                print(f"Error loading agent {agent_id}: {str(e)}")
-                continue
-    
+            # Extract agent information from the response
+            result = response.get("result", {})
+            if result and result.get("type") == "task":
+                task = result.get("task", {})
+                artifacts = task.get("artifacts", [])
+                
+                # Find the agent info artifact
+                for artifact in artifacts:
+                    parts = artifact.get("parts", [])
+                    for part in parts:
+                        if part.get("type") == "DataPart":
+                            agent_data = part.get("content", {})
+                            if agent_data and isinstance(agent_data, dict):
+                                # Create agent info object
+                                agent_info = AgentInfo(
+                                    id=agent_id,
+                                    name=agent_data.get("name", agent_id),
+                                    url=agent_data.get("url", ""),
+                                    description=agent_data.get("description", "")
+                                )
+                                
+                                # Create and add the handoff tool
+                                tool = create_arc_handoff_tool(
+                                    agent_info,
+                                    arc_client,
+                                    cache=cache,
+                                    semaphore=(semaphores or {}).get(agent_id),
+                                    cache_ttl=(cache_ttls or {}).get(agent_id)
+                                )
+                                tools.append(tool)
+                                break
+        
+        except Exception as e:
+            print(f"Error loading agent {agent_id}: {str(e)}")
+            continue
+
     return tools
 
 
@@ -0,0 +1,41 @@
+"""
+Runtime setup shared by the examples.
+"""
+
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+# Print agent steps only when debugging
+DEBUG = os.environ.get("ARC_DEBUG") == "1"
+
+# Use the faster uvloop event loop when it is installed (arc-adaptors[fast])
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run(main: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run an example's main coroutine function.
+    
+    Args:
+        main: Coroutine function to run
+        
+    Returns:
+        The result of main()
+    """
+    async def _main() -> Any:
+        # Blocking fallbacks (e.g. sync HTTP calls) run on the default executor
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=32))
+        return await main()
+    
+    if uvloop is None:
+        return asyncio.run(_main(), debug=False)
+    if sys.version_info >= (3, 11):
+        return uvloop.run(_main(), debug=False)
+    uvloop.install()
+    return asyncio.run(_main(), debug=False)
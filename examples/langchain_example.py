@@ -3,16 +3,16 @@
 Example of using the ARCLangChainAdaptor to integrate ARC Protocol with LangChain.
 """
 
-import asyncio
-import os
 from typing import List
 
+from _runtime import DEBUG, run
+
 from langchain_core.tools import BaseTool
-from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_react_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
-from arc_adaptors.langchain import ARCLangChainAdaptor
+from arc_adaptors.langchain import ARCLangChainAdaptor, get_shared_llm
+from arc_adaptors.langchain.http import get_shared_async_client
 
 
 async def main():
@@ -26,7 +26,8 @@ async def main():
     adaptor = ARCLangChainAdaptor(
         arc_endpoint=arc_endpoint,
         ledger_url=ledger_url,
-        agent_ids=agent_ids
+        agent_ids=agent_ids,
+        http_client=get_shared_async_client()  # Share the LLM's connection pool
     )
     
     # Load the handoff tools
@@ -38,7 +39,7 @@ async def main():
         print(f"  - {tool.name}: {tool.description}")
     
     # Create a LangChain agent with the handoff tools
-    llm = ChatOpenAI(model="gpt-4")
+    llm = get_shared_llm("gpt-4")
     
     # Create a prompt that includes instructions for using handoff tools
     prompt = ChatPromptTemplate.from_messages([
@@ -57,7 +58,7 @@ async def main():
     agent_executor = AgentExecutor(
         agent=agent,
         tools=tools,
-        verbose=True,
+        verbose=DEBUG,
         handle_parsing_errors=True,
     )
     
@@ -74,4 +75,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main)
@@ -4,16 +4,111 @@ Example of using the ARCLangChainAdaptor with a supervisor agent that delegates
 """
 
 import asyncio
-import os
-from typing import Dict, List, Any
+import functools
+import hashlib
+import logging
+import uuid
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Deque, Dict, List, Any, AsyncIterator, Optional, Tuple, Union
+
+from _runtime import run
 
 from langchain_core.tools import BaseTool
-from langchain_openai import ChatOpenAI
-from langchain.agents import AgentExecutor, create_react_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, Field
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from arc_adaptors.langchain import (
+    ARCLangChainAdaptor,
+    HandoffPrefetchHandler,
+    LLMCache,
+    create_arc_batch_tool,
+    get_shared_llm,
+)
+from arc_adaptors.langchain.cache import TokenUsageHandler, ToolTTLHandler
+from arc_adaptors.langchain.http import get_shared_async_client, get_shared_sync_client
+
+logger = logging.getLogger(__name__)
+
+# System prompt of the supervisor agent
+SUPERVISOR_SYSTEM_PROMPT = """You are a supervisor agent that delegates tasks to specialized agents.
+When you receive a request that requires specialized knowledge or capabilities,
+use the appropriate handoff tool to transfer the request to a specialized agent.
+
+Always analyze the request carefully to determine which agent is best suited to handle it.
+Only use handoff tools when necessary - if you can answer directly, do so.
+When a request needs several independent agents, call all of their handoff
+tools at once (or use the batch tool) instead of one after another.
+
+Available specialized agents:
+{agent_descriptions}
+"""
+
+# Maximum number of LLM calls per turn, matching AgentExecutor's default
+MAX_AGENT_ITERATIONS = 15
+
+# Prompt for the router that sends single-agent requests straight to a handoff tool
+ROUTER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """Decide whether a request can be handled entirely by exactly one of these agents:
+    {agent_descriptions}
+    
+    If one agent can handle the whole request on its own, return its tool name, the message
+    to send to it, and your confidence between 0 and 1. If the request needs several agents,
+    or none of them, return null as the agent."""),
+    MessagesPlaceholder(variable_name="chat_history"),
+    ("human", "{input}"),
+])
 
-from arc_adaptors.langchain import ARCLangChainAdaptor
+
+# Prompt for folding messages that no longer fit the history budget into a summary
+SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """Update the summary of a conversation between a user and a supervisor agent
+    with the messages below. Keep facts, results and open requests; stay under 200 words.
+    
+    Current summary:
+    {summary}"""),
+    MessagesPlaceholder(variable_name="messages"),
+])
+
+
+def _load_encoding(model_name: str) -> Optional[Any]:
+    """Load the tokenizer of a model, or None if it is not available."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # tiktoken downloads encodings on first use
+        logger.warning("Failed to load tokenizer, estimating token counts: %s", e)
+        return None
+
+
+class OutputMode(str, Enum):
+    """What the supervisor keeps of the messages produced by a handoff."""
+    
+    LAST_MESSAGE = "last_message"
+    FULL_HISTORY = "full_history"
+
+
+class RouteDecision(BaseModel):
+    """Routing decision for a user request."""
+    
+    agent: Optional[str] = Field(
+        None,
+        description="Tool name of the single agent that can handle the request, or null"
+    )
+    message: str = Field("", description="Message to send to the agent")
+    confidence: float = Field(0.0, description="Confidence in the decision between 0 and 1")
 
 
 class SupervisorAgent:
@@ -21,11 +116,23 @@ class SupervisorAgent:
     A supervisor agent that delegates tasks to specialized agents.
     """
     
+    # Tool-bound LLMs shared by all supervisors, least recently used first
+    _bound_llms: "OrderedDict[Tuple[Any, ...], Runnable]" = OrderedDict()
+    max_bound_llms = 128
+    
     def __init__(
         self,
         adaptor: ARCLangChainAdaptor,
         model_name: str = "gpt-4",
-        output_mode: str = "last_message"
+        output_mode: Union[OutputMode, str] = OutputMode.LAST_MESSAGE,
+        temperature: float = 0.0,
+        cache: Optional[LLMCache] = None,
+        router_model: Optional[str] = "gpt-4o-mini",
+        router_threshold: float = 0.8,
+        max_history_tokens: int = 4000,
+        summary_model: str = "gpt-4o-mini",
+        summary_refresh_turns: int = 4,
+        ledger_log: bool = False
     ):
         """
         Initialize the supervisor agent.
@@ -33,57 +140,266 @@ class SupervisorAgent:
         Args:
             adaptor: ARCLangChainAdaptor for communication with ARC agents
             model_name: Name of the LLM model to use
-            output_mode: Output mode for handoffs ("last_message" or "full_history")
+            output_mode: Output mode for handoffs (OutputMode or its value,
+                "last_message" or "full_history")
+            temperature: Sampling temperature of the LLM
+            cache: Optional cache of whole turns, only used when temperature is 0.
+                Turns expire with the shortest cache TTL of the handoffs they made.
+            router_model: Name of the model routing single-agent requests directly
+                to a handoff tool, or None to always run the full agent
+            router_threshold: Minimum router confidence for a direct handoff
+            max_history_tokens: Token budget of the chat history sent with each turn;
+                older messages are folded into a running summary
+            summary_model: Name of the model that writes the running summary
+            summary_refresh_turns: Minimum number of turns between summary updates
+            ledger_log: Whether to append every exchange to the ARC Ledger; the
+                payload format is provisional (see append_to_ledger)
         """
         self.adaptor = adaptor
         self.model_name = model_name
-        self.output_mode = output_mode
+        self.output_mode = OutputMode(output_mode)
+        self.temperature = temperature
+        self.cache = cache if temperature == 0 else None
+        self.router_model = router_model
+        self.router_threshold = router_threshold
         self.tools: List[BaseTool] = []
-        self.agent_executor = None
-        self.chat_history = []
+        self._tools_by_name: Dict[str, BaseTool] = {}
+        self._router = None
+        self._prefetch: Optional[HandoffPrefetchHandler] = None
+        self._agent_descriptions = ""
+        self._static_system: Optional[SystemMessage] = None
+        self._prompt_cache_prefix = ""
+        self._prompt_cache_generation = 0
+        self._bound_llm: Optional[Runnable] = None
+        self._agent_tools_by_name: Dict[str, BaseTool] = {}
+        # Bound the history by message count too: even short messages cost a
+        # few tokens, so the token budget normally binds first
+        self.chat_history: Deque[Any] = deque(maxlen=max(2, max_history_tokens // 4) // 2 * 2)
+        self.session_id = str(uuid.uuid4())
+        self.ledger_log = ledger_log
+        self._max_history_tokens = max_history_tokens
+        self._history_tokens = 0
+        self._summary_model = summary_model
+        self._summary_refresh_turns = summary_refresh_turns
+        self._running_summary = ""
+        self._unsummarized: List[Any] = []
+        self._unsummarized_tokens = 0
+        self._turns_since_summary = summary_refresh_turns
+        self._summary_task: Optional[asyncio.Task] = None
+        self._encoding = None
+    
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Let a running summary update finish before the clients are closed
+        if self._summary_task is not None:
+            await self._summary_task
+        await self.adaptor.close()
     
     async def initialize(self):
         """Initialize the supervisor agent with handoff tools."""
-        # Load the handoff tools
-        self.tools = await self.adaptor.load_tools()
+        # The lru_cached client factories are not thread-safe, so create the
+        # shared pools here before the LLMs are built in executor threads
+        get_shared_async_client()
+        get_shared_sync_client()
+        
+        # Load the handoff tools while the LLMs are created in the background;
+        # later get_shared_llm() calls return the same instances
+        loop = asyncio.get_running_loop()
+        models = [(self.model_name, self.temperature)]
+        if self.router_model:
+            models.append((self.router_model, 0))
+        self.tools, *_ = await asyncio.gather(
+            self.adaptor.load_tools(),
+            *[
+                loop.run_in_executor(None, functools.partial(get_shared_llm, model, temperature=temperature))
+                # Create each model once even if the router uses the main model
+                for model, temperature in dict.fromkeys(models)
+            ]
+        )
         
-        # Create the LLM
-        llm = ChatOpenAI(model=self.model_name)
+        # The tools do not change after initialization, so describe them once
+        self._agent_descriptions = "\n".join(
+            f"- {tool.name}: {tool.description}" for tool in self.tools
+        )
+        self._tools_by_name = {tool.name: tool for tool in self.tools}
         
-        # Create a prompt that includes instructions for using handoff tools
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a supervisor agent that delegates tasks to specialized agents.
-            When you receive a request that requires specialized knowledge or capabilities,
-            use the appropriate handoff tool to transfer the request to a specialized agent.
-            
-            Always analyze the request carefully to determine which agent is best suited to handle it.
-            Only use handoff tools when necessary - if you can answer directly, do so.
-            
-            Available specialized agents:
-            {agent_descriptions}
-            """),
-            MessagesPlaceholder(variable_name="chat_history"),
-            ("human", "{input}"),
-            MessagesPlaceholder(variable_name="agent_scratchpad"),
-        ])
-        
-        # Create the agent
-        agent = create_react_agent(llm, self.tools, prompt)
-        
-        # Create the agent executor
-        self.agent_executor = AgentExecutor(
-            agent=agent,
-            tools=self.tools,
-            verbose=True,
-            handle_parsing_errors=True,
+        # Everything that stays the same between turns goes into one leading
+        # system message, so that providers can cache the prompt prefix
+        self._static_system = SystemMessage(
+            content=SUPERVISOR_SYSTEM_PROMPT.format(agent_descriptions=self._agent_descriptions)
         )
+        digest = hashlib.sha256(self._static_system.content.encode("utf-8")).hexdigest()
+        self._prompt_cache_prefix = f"arc-supervisor-{digest[:16]}"
+        self._bind_tools()
+        
+        # Count history tokens with the model's tokenizer when tiktoken is installed
+        self._encoding = _load_encoding(self.model_name)
+        
+        # Warm up the ARC connection while the LLM is still streaming a handoff
+        self._prefetch = HandoffPrefetchHandler(self.adaptor, self.tools)
+        
+        # Create a small model that routes single-agent requests
+        if self.router_model:
+            router_llm = get_shared_llm(self.router_model, temperature=0)
+            self._router = ROUTER_PROMPT | router_llm.with_structured_output(RouteDecision)
+    
+    @property
+    def _prompt_cache_key(self) -> str:
+        """OpenAI prompt cache key shared by supervisors with the same static prompt."""
+        return f"{self._prompt_cache_prefix}-{self._prompt_cache_generation}"
     
-    def _get_agent_descriptions(self) -> str:
-        """Get descriptions of available specialized agents."""
-        descriptions = []
-        for tool in self.tools:
-            descriptions.append(f"- {tool.name}: {tool.description}")
-        return "\n".join(descriptions)
+    def _bind_tools(self) -> None:
+        """Bind the tools to the LLM for the current prompt cache key."""
+        # The batch tool gives models without native parallel tool calls a way
+        # to fan out to several agents in one step
+        agent_tools = self.tools + [create_arc_batch_tool(self.tools)]
+        self._agent_tools_by_name = {tool.name: tool for tool in agent_tools}
+        
+        # Supervisors with the same tools, model and static prompt share one
+        # tool-bound LLM; the tools themselves are only run by the supervisor
+        key = (
+            tuple(tool.name for tool in agent_tools),
+            self.model_name,
+            self.temperature,
+            self._prompt_cache_key
+        )
+        bound_llm = self._bound_llms.get(key)
+        if bound_llm is None:
+            llm = get_shared_llm(self.model_name, temperature=self.temperature)
+            # Route requests sharing the static prefix to the same prompt cache
+            bound_llm = llm.bind_tools(agent_tools, prompt_cache_key=self._prompt_cache_key)
+            self._bound_llms[key] = bound_llm
+            while len(self._bound_llms) > self.max_bound_llms:
+                self._bound_llms.popitem(last=False)
+        else:
+            self._bound_llms.move_to_end(key)
+        self._bound_llm = bound_llm
+    
+    def _messages(self, user_input: str, chat_history: List[Any]) -> List[Any]:
+        """
+        Build the messages sent to the LLM for a turn.
+        
+        Only the end changes between turns: [static system, *chat history,
+        user input], followed by the tool calls and results of the turn.
+        
+        Args:
+            user_input: User input text
+            chat_history: Messages preceding the user input
+            
+        Returns:
+            Messages of the turn
+        """
+        return [self._static_system, *chat_history, HumanMessage(content=user_input)]
+    
+    def _count_tokens(self, message: Any) -> int:
+        """Count the tokens of a message, estimating when tiktoken is unavailable."""
+        content = str(message.content)
+        if self._encoding is not None:
+            return len(self._encoding.encode(content))
+        return len(content) // 4 + 1
+    
+    def _history(self) -> List[Any]:
+        """Get the chat history to send with a turn, led by the running summary."""
+        if not self._running_summary:
+            return list(self.chat_history)
+        summary = SystemMessage(content=f"Summary of the earlier conversation: {self._running_summary}")
+        return [summary, *self.chat_history]
+    
+    def _add_to_history(self, user_input: str, agent_message: str) -> None:
+        """
+        Add an exchange to the chat history, keeping it within the token budget.
+        
+        Messages dropped from the history are folded into the running summary
+        in the background, so the turn does not wait for the summary model.
+        
+        Args:
+            user_input: User input text
+            agent_message: Response to the user input
+        """
+        # Make room without letting the deque drop messages unsummarized
+        while len(self.chat_history) > self.chat_history.maxlen - 2:
+            self._drop_oldest_exchange()
+        
+        for message in (HumanMessage(content=user_input), AIMessage(content=agent_message)):
+            self.chat_history.append(message)
+            self._history_tokens += self._count_tokens(message)
+        self._turns_since_summary += 1
+        
+        # Keep the full conversation in the ARC Ledger without waiting for it
+        if self.ledger_log:
+            self.adaptor.append_to_ledger(
+                [
+                    {"role": "user", "parts": [{"type": "TextPart", "content": user_input}]},
+                    {"role": "agent", "parts": [{"type": "TextPart", "content": agent_message}]}
+                ],
+                metadata={"session_id": self.session_id}
+            )
+        
+        # Drop the oldest exchanges until the history fits the budget again
+        while self._history_tokens > self._max_history_tokens and len(self.chat_history) > 2:
+            self._drop_oldest_exchange()
+        
+        if (
+            self._unsummarized
+            and self._turns_since_summary >= self._summary_refresh_turns
+            and self._summary_task is None
+        ):
+            self._summary_task = asyncio.ensure_future(self._refresh_summary())
+            self._summary_task.add_done_callback(self._on_summary_done)
+    
+    def _drop_oldest_exchange(self) -> None:
+        """Move the oldest exchange from the chat history to the messages awaiting summary."""
+        for _ in range(2):
+            message = self.chat_history.popleft()
+            tokens = self._count_tokens(message)
+            self._history_tokens -= tokens
+            self._unsummarized.append(message)
+            self._unsummarized_tokens += tokens
+        
+        # While the summary model keeps failing, give up on the oldest messages
+        # instead of sending an ever larger summary prompt
+        dropped = 0
+        while self._unsummarized_tokens > self._max_history_tokens and len(self._unsummarized) > 2:
+            for message in self._unsummarized[:2]:
+                self._unsummarized_tokens -= self._count_tokens(message)
+            del self._unsummarized[:2]
+            dropped += 2
+        if dropped:
+            logger.warning("Dropped %d messages from the chat history without summarizing them", dropped)
+    
+    def _on_summary_done(self, task: asyncio.Task) -> None:
+        """Allow the next summary update once the current one has finished."""
+        self._summary_task = None
+    
+    async def _refresh_summary(self) -> None:
+        """Fold the messages dropped from the chat history into the running summary."""
+        # Messages dropped while the summary is being written wait for the next update
+        messages = list(self._unsummarized)
+        summarizer = SUMMARY_PROMPT | get_shared_llm(self._summary_model, temperature=0)
+        try:
+            response = await summarizer.ainvoke({
+                "summary": self._running_summary or "(none)",
+                "messages": messages
+            })
+        except Exception as e:
+            # Keep the messages and retry on the next turn
+            logger.warning("Failed to update the conversation summary: %s", e)
+            return
+        
+        self._running_summary = response.content
+        # Some of the summarized messages may have been dropped in the meantime
+        summarized = {id(message) for message in messages}
+        self._unsummarized = [m for m in self._unsummarized if id(m) not in summarized]
+        self._unsummarized_tokens = sum(self._count_tokens(m) for m in self._unsummarized)
+        self._turns_since_summary = 0
+        
+        # The new summary changes the history right after the static prefix;
+        # start a new prompt cache instead of silently missing the old one
+        self._prompt_cache_generation += 1
+        self._bind_tools()
     
     def _process_output(self, output: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -95,17 +411,216 @@ class SupervisorAgent:
         Returns:
             Processed output
         """
-        messages = output.get("messages", [])
-        
-        if self.output_mode == "last_message":
-            # Keep only the last message
+        # Trim the messages in place; trimming twice is harmless, so this
+        # is safe for results that are also held by the response cache
+        if self.output_mode is OutputMode.LAST_MESSAGE:
+            messages = output.get("messages")
             if messages:
-                messages = [messages[-1]]
+                output["messages"] = [messages[-1]]
+        
+        return output
+    
+    async def _route(
+        self,
+        user_input: str,
+        chat_history: List[Any],
+        config: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Hand a single-agent request directly to the agent's handoff tool.
+        
+        Args:
+            user_input: User input text
+            chat_history: Messages preceding the user input
+            config: Runnable config for the router call
+            
+        Returns:
+            The turn result, or None if the request needs the full agent
+        """
+        if self._router is None:
+            return None
+        
+        try:
+            decision = await self._router.ainvoke(
+                {
+                    "input": user_input,
+                    "chat_history": chat_history,
+                    "agent_descriptions": self._agent_descriptions
+                },
+                config=config
+            )
+        except Exception as e:
+            logger.warning("Router failed, falling back to the full agent: %s", e)
+            return None
+        
+        tool = self._tools_by_name.get(decision.agent or "")
+        if tool is None or decision.confidence < self.router_threshold:
+            return None
+        
+        output = await tool.ainvoke({"message": decision.message or user_input}, config=config)
+        return {"input": user_input, "output": output}
+    
+    async def _call_tool(self, tool_call: Dict[str, Any], config: Dict[str, Any]) -> ToolMessage:
+        """
+        Run a tool call requested by the LLM.
+        
+        Args:
+            tool_call: Tool call from the LLM response
+            config: Runnable config for the tool
+            
+        Returns:
+            Message with the tool's output, or with the error for the LLM to
+            correct, e.g. invalid arguments
+        """
+        tool = self._agent_tools_by_name.get(tool_call["name"])
+        if tool is None:
+            output = (
+                f"{tool_call['name']} is not a valid tool, "
+                f"try one of [{', '.join(self._agent_tools_by_name)}]."
+            )
+            return ToolMessage(content=output, tool_call_id=tool_call["id"], status="error")
         
-        return {
-            **output,
-            "messages": messages
-        }
+        try:
+            output = await tool.ainvoke(tool_call["args"], config=config)
+        except Exception as e:
+            return ToolMessage(
+                content=f"Error invoking {tool_call['name']}: {str(e)}",
+                tool_call_id=tool_call["id"],
+                status="error"
+            )
+        return ToolMessage(content=str(output), tool_call_id=tool_call["id"])
+    
+    async def _agent_loop(
+        self,
+        messages: List[Any],
+        config: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Run the agent loop on the tool-bound LLM.
+        
+        The tool calls of each response run concurrently and their results
+        are sent back to the LLM until it answers without calling tools.
+        
+        Text is streamed as soon as it arrives, before it is known whether
+        the response also calls tools, so the answer of the turn is all the
+        text of the turn, e.g. "Let me check the weather." followed by the
+        answer written after the handoff.
+        
+        Args:
+            messages: Messages of the turn, ending with the user input
+            config: Runnable config for the LLM and tool calls
+            
+        Yields:
+            ("chunk", text) for each streamed piece of text, then
+            ("output", text) with all the streamed text
+        """
+        messages = list(messages)
+        streamed: List[str] = []
+        for _ in range(MAX_AGENT_ITERATIONS):
+            response = None
+            separated = not streamed
+            async for chunk in self._bound_llm.astream(messages, config=config):
+                if chunk.content and isinstance(chunk.content, str):
+                    if not separated:
+                        # Keep the text of consecutive responses apart
+                        streamed.append("\n\n")
+                        yield "chunk", "\n\n"
+                        separated = True
+                    streamed.append(chunk.content)
+                    yield "chunk", chunk.content
+                response = chunk if response is None else response + chunk
+            
+            if response is None or not response.tool_calls:
+                yield "output", "".join(streamed)
+                return
+            
+            tool_messages = await asyncio.gather(
+                *[self._call_tool(tool_call, config) for tool_call in response.tool_calls]
+            )
+            messages.extend([response, *tool_messages])
+        
+        stopped = "Agent stopped due to max iterations."
+        if streamed:
+            stopped = "\n\n" + stopped
+        yield "chunk", stopped
+        yield "output", "".join(streamed) + stopped
+    
+    async def _run_direct(
+        self,
+        user_input: str,
+        messages: List[Any],
+        config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Run the agent loop to completion.
+        
+        Args:
+            user_input: User input text
+            messages: Messages of the turn, ending with the user input
+            config: Runnable config for the LLM and tool calls
+            
+        Returns:
+            The turn result
+        """
+        output = ""
+        async for kind, text in self._agent_loop(messages, config):
+            if kind == "output":
+                output = text
+        return {"input": user_input, "output": output}
+    
+    async def _run_turn(self, user_input: str, chat_history: List[Any]) -> str:
+        """
+        Run a single turn of the supervisor agent.
+        
+        Args:
+            user_input: User input text
+            chat_history: Messages preceding the user input
+            
+        Returns:
+            Response from the supervisor agent or specialized agent
+        """
+        # Reuse the response to an identical prompt instead of running the agent
+        cache_key = None
+        result = None
+        if self.cache is not None:
+            cache_key = self.cache.cache_key(
+                self.model_name,
+                [*chat_history, HumanMessage(content=user_input)],
+                [tool.name for tool in self.tools],
+                self.temperature
+            )
+            result = self.cache.get(cache_key)
+        
+        if result is None:
+            usage = TokenUsageHandler()
+            tool_ttl = ToolTTLHandler()
+            config = {"callbacks": [usage, tool_ttl, self._prefetch]}
+            
+            # Skip the agent loop when a single handoff answers the request
+            result = await self._route(user_input, chat_history, config)
+            if result is None:
+                result = await self._run_direct(
+                    user_input,
+                    self._messages(user_input, chat_history),
+                    config
+                )
+            
+            # A turn is only as fresh as the handoff results it is built from,
+            # and one built from a failed handoff is not cached at all
+            if cache_key is not None and not tool_ttl.failed:
+                self.cache.set(cache_key, result, tokens=usage.total_tokens, ttl=tool_ttl.ttl)
+        
+        if self.cache is not None:
+            logger.info(
+                "cache_hits=%d tokens_saved=%d",
+                self.cache.cache_hits,
+                self.cache.tokens_saved
+            )
+        
+        # Process the output
+        output = self._process_output(result)
+        
+        return output.get("output", "")
     
     async def process_request(self, user_input: str) -> str:
         """
@@ -117,30 +632,94 @@ class SupervisorAgent:
         Returns:
             Response from the supervisor agent or specialized agent
         """
-        if not self.agent_executor:
+        if self._bound_llm is None:
             await self.initialize()
         
-        # Add user message to chat history
-        self.chat_history.append(HumanMessage(content=user_input))
+        # Run the turn against the history preceding this message
+        agent_message = await self._run_turn(user_input, self._history())
         
-        # Prepare input for the agent executor
-        input_data = {
-            "input": user_input,
-            "chat_history": self.chat_history[:-1],  # Exclude the latest message
-            "agent_descriptions": self._get_agent_descriptions()
-        }
+        # Add the exchange to chat history
+        self._add_to_history(user_input, agent_message)
         
-        # Run the agent executor
-        result = await self.agent_executor.ainvoke(input_data)
+        return agent_message
+    
+    async def stream_request(self, user_input: str) -> AsyncIterator[str]:
+        """
+        Process a user request, yielding the response as it is generated.
         
-        # Process the output
-        output = self._process_output(result)
+        Streamed turns bypass the response cache.
+        
+        Args:
+            user_input: User input text
+            
+        Yields:
+            Chunks of the response from the supervisor agent
+        """
+        if self._bound_llm is None:
+            await self.initialize()
         
-        # Add agent response to chat history
-        agent_message = output.get("output", "")
-        self.chat_history.append(AIMessage(content=agent_message))
+        chat_history = self._history()
+        config = {"callbacks": [self._prefetch]}
         
-        return agent_message
+        # Take the same path as process_request, streaming the agent's answer
+        result = await self._route(user_input, chat_history, config)
+        if result is not None:
+            agent_message = result["output"]
+            yield agent_message
+        else:
+            agent_message = ""
+            async for kind, text in self._agent_loop(self._messages(user_input, chat_history), config):
+                if kind == "chunk":
+                    yield text
+                else:
+                    agent_message = text
+        
+        # Add the exchange to chat history
+        self._add_to_history(user_input, agent_message)
+    
+    async def process_requests_batch(
+        self,
+        inputs: List[str],
+        max_concurrency: int = 5,
+        delay: float = 0.0
+    ) -> List[Union[str, Exception]]:
+        """
+        Process independent user requests concurrently.
+        
+        Each request sees its own copy of the current chat history, and the
+        batch does not add to the chat history. A failed request does not
+        affect the others: its exception is returned in place of its response.
+        
+        Args:
+            inputs: User input texts
+            max_concurrency: Maximum number of requests in flight at once
+            delay: Seconds to wait between starting consecutive requests
+            
+        Returns:
+            Responses, or the exceptions of failed requests, in the same order
+            as the inputs
+            
+        Raises:
+            ValueError: If max_concurrency is not positive
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        
+        if self._bound_llm is None:
+            await self.initialize()
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _run(index: int, user_input: str) -> str:
+            if delay:
+                await asyncio.sleep(index * delay)
+            async with semaphore:
+                return await self._run_turn(user_input, self._history())
+        
+        return await asyncio.gather(
+            *[_run(i, user_input) for i, user_input in enumerate(inputs)],
+            return_exceptions=True
+        )
 
 
 async def main():
@@ -150,33 +729,52 @@ async def main():
     ledger_url = "https://ledger.example.com/arc"  # Replace with your ARC Ledger URL
     agent_ids = ["math-agent", "weather-agent", "news-agent"]  # Replace with your agent IDs
     
+    # Share one cache between the supervisor and the handoff tools
+    cache = LLMCache()
+    
     # Create the adaptor
     adaptor = ARCLangChainAdaptor(
         arc_endpoint=arc_endpoint,
         ledger_url=ledger_url,
-        agent_ids=agent_ids
+        agent_ids=agent_ids,
+        cache=cache,
+        http_client=get_shared_async_client(),  # Share the LLM's connection pool
+        # Keep volatile answers briefly and stable ones for longer
+        config={"cache_ttls": {"weather-agent": 300, "news-agent": 600, "math-agent": 86400}}
     )
     
-    # Create the supervisor agent
-    supervisor = SupervisorAgent(adaptor, output_mode="last_message")
-    
-    # Process a sample request
-    user_input = "I need to know the weather in New York and also calculate 25 * 16"
-    print(f"User: {user_input}")
-    
-    response = await supervisor.process_request(user_input)
-    print(f"Agent: {response}")
-    
-    # Process a follow-up request
-    user_input = "Now I need the latest news about technology"
-    print(f"User: {user_input}")
-    
-    response = await supervisor.process_request(user_input)
-    print(f"Agent: {response}")
-    
-    # Close the adaptor
-    await adaptor.close()
+    # Create the supervisor agent; it is initialized before the first request
+    # and closes the adaptor on exit
+    async with SupervisorAgent(adaptor, output_mode=OutputMode.LAST_MESSAGE, cache=cache) as supervisor:
+        # Process a sample request
+        user_input = "I need to know the weather in New York and also calculate 25 * 16"
+        print(f"User: {user_input}")
+        
+        response = await supervisor.process_request(user_input)
+        print(f"Agent: {response}")
+        
+        # Process a follow-up request, printing the response as it streams in
+        user_input = "Now I need the latest news about technology"
+        print(f"User: {user_input}")
+        
+        print("Agent: ", end="", flush=True)
+        async for chunk in supervisor.stream_request(user_input):
+            print(chunk, end="", flush=True)
+        print()
+        
+        # Process independent requests concurrently
+        user_inputs = [
+            "What's the weather in London?",
+            "Calculate 12 * 12",
+        ]
+        responses = await supervisor.process_requests_batch(user_inputs, max_concurrency=2)
+        for user_input, response in zip(user_inputs, responses):
+            print(f"User: {user_input}")
+            if isinstance(response, Exception):
+                print(f"Error: {response}")
+            else:
+                print(f"Agent: {response}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main)
@@ -33,6 +33,11 @@ setup(
         "mistral": ["mistralai>=0.0.7"],
         "langchain": ["langchain>=0.0.267"],
         "llama-index": ["llama-index>=0.8.0"],
+        "fast": [
+            "uvloop>=0.19; sys_platform != 'win32'",
+            "orjson>=3.9.0",
+            "blake3>=0.3.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",
@@ -2,12 +2,34 @@
 Tests for the LangChain adaptor.
 """
 
+import httpcore
+import httpx
 import pytest
 import asyncio
+import socket
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from arc_adaptors.langchain import ARCLangChainAdaptor
-from arc_adaptors.langchain.tools import AgentInfo, create_arc_handoff_tool
+from arc import Client as ARCClient
+from arc.exceptions import InvalidRequestError, RateLimitExceededError
+
+from arc_adaptors.langchain import (
+    AdaptiveSemaphore,
+    ARCLangChainAdaptor,
+    HandoffPrefetchHandler,
+    LLMCache,
+    cached_tool,
+    get_shared_llm,
+)
+from arc_adaptors.langchain.http import (
+    CachingNetworkBackend,
+    DNSCache,
+    create_http_client,
+    get_shared_async_client,
+    share_http_client,
+)
+from arc_adaptors.langchain.cache import ToolTTLHandler
+from arc_adaptors.langchain.concurrency import is_backpressure_error
+from arc_adaptors.langchain.tools import AgentInfo, create_arc_batch_tool, create_arc_handoff_tool
 
 
 class TestARCLangChainAdaptor:
@@ -67,6 +89,117 @@ class TestARCLangChainAdaptor:
                     agent_ids=[]
                 )
     
+    @pytest.mark.asyncio
+    async def test_clients_share_connection_pool(self, adaptor):
+        """Test that the ARC and ledger clients share one HTTP client."""
+        assert adaptor.arc_client.http_client is adaptor.http_client
+        assert adaptor.ledger_client.http_client is adaptor.http_client
+        
+        await adaptor.close()
+        assert adaptor.http_client.is_closed
+    
+    @pytest.mark.asyncio
+    async def test_share_http_client_closes_replaced_client(self):
+        """Test that the HTTP client created by the ARC client is closed."""
+        arc_client = ARCClient(endpoint="https://api.example.com/arc")
+        replaced = arc_client.http_client
+        shared = httpx.AsyncClient()
+        
+        assert share_http_client(arc_client, shared).http_client is shared
+        await asyncio.sleep(0.01)
+        
+        assert replaced.is_closed
+        assert not shared.is_closed
+        await shared.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_injected_http_client_is_not_closed(self):
+        """Test that the adaptor leaves an injected HTTP client open."""
+        http_client = AsyncMock()
+        with patch("arc_adaptors.langchain.adaptor.ARCClient", return_value=AsyncMock()):
+            adaptor = ARCLangChainAdaptor(
+                arc_endpoint="https://api.example.com/arc",
+                ledger_url="https://ledger.example.com/arc",
+                agent_ids=["math-agent"],
+                http_client=http_client
+            )
+        
+        assert adaptor.arc_client.http_client is http_client
+        await adaptor.close()
+        http_client.aclose.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_warm_up_is_throttled(self, adaptor):
+        """Test that warm-ups within the keep-alive period are skipped."""
+        with patch.object(adaptor.http_client, "head", new=AsyncMock()) as mock_head:
+            await adaptor.warm_up()
+            await adaptor.warm_up()
+        
+        mock_head.assert_called_once_with("https://api.example.com/arc")
+    
+    @pytest.mark.asyncio
+    async def test_append_to_ledger_is_awaited_on_close(self, adaptor):
+        """Test that ledger appends run in the background and finish on close."""
+        adaptor.ledger_client.task.create = AsyncMock(side_effect=[RuntimeError("down"), {}])
+        messages = [{"role": "user", "parts": [{"type": "TextPart", "content": "Hi"}]}]
+        
+        adaptor.append_to_ledger(messages)
+        adaptor.append_to_ledger(messages, metadata={"session_id": "s1"})
+        assert adaptor.ledger_client.task.create.await_count == 0
+        
+        await adaptor.close()
+        assert adaptor.ledger_client.task.create.await_count == 2
+        assert adaptor.ledger_client.task.create.call_args.kwargs["metadata"] == {
+            "type": "append",
+            "session_id": "s1"
+        }
+    
+    @pytest.mark.asyncio
+    async def test_dns_cache_prefers_ipv4_and_expires(self):
+        """Test that resolved addresses are cached until the TTL elapses."""
+        dns_cache = DNSCache(ttl=0.05)
+        infos = [
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("2001:db8::1", 443, 0, 0)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", 443)),
+        ]
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, "getaddrinfo", new=AsyncMock(return_value=infos)):
+            assert await dns_cache.resolve("api.example.com", 443) == "192.0.2.1"
+        
+        assert dns_cache.get("api.example.com", 443) == "192.0.2.1"
+        await asyncio.sleep(0.06)
+        assert dns_cache.get("api.example.com", 443) is None
+    
+    @pytest.mark.asyncio
+    async def test_network_backend_connects_to_cached_address(self):
+        """Test that connections use the cached address and fall back to DNS."""
+        dns_cache = DNSCache()
+        dns_cache._addresses[("api.example.com", 443)] = ("192.0.2.1", float("inf"))
+        inner = AsyncMock()
+        backend = CachingNetworkBackend(inner, dns_cache)
+        
+        await backend.connect_tcp("api.example.com", 443)
+        assert inner.connect_tcp.call_args.args[0] == "192.0.2.1"
+        
+        # A stale address is dropped and the host is resolved normally
+        inner.connect_tcp.side_effect = [httpcore.ConnectError("refused"), MagicMock()]
+        await backend.connect_tcp("api.example.com", 443)
+        assert inner.connect_tcp.call_args.args[0] == "api.example.com"
+        assert dns_cache.get("api.example.com", 443) is None
+    
+    @pytest.mark.asyncio
+    async def test_create_http_client_installs_dns_cache(self):
+        """Test that pooled clients connect through the DNS cache."""
+        dns_cache = DNSCache()
+        client = create_http_client(dns_cache=dns_cache, retries=1)
+        try:
+            pool = client._transport._pool
+            assert isinstance(pool._network_backend, CachingNetworkBackend)
+            assert pool._network_backend.dns_cache is dns_cache
+            assert pool._retries == 1
+        finally:
+            await client.aclose()
+    
     @pytest.mark.asyncio
     async def test_process_request(self, adaptor, mock_arc_client):
         """Test processing an ARC request."""
@@ -147,7 +280,8 @@ class TestARCLangChainAdaptor:
         mock_tools = [mock_tool1, mock_tool2]
         
         # Mock the load_arc_handoff_tools function
-        with patch("arc_adaptors.langchain.adaptor.load_arc_handoff_tools", return_value=mock_tools) as mock_load:
+        with patch("arc_adaptors.langchain.adaptor.load_arc_handoff_tools", return_value=mock_tools) as mock_load, \
+                patch.object(adaptor, "resolve_hosts", new=AsyncMock()):
             # Load tools
             tools = await adaptor.load_tools()
             
@@ -155,7 +289,11 @@ class TestARCLangChainAdaptor:
             mock_load.assert_called_once_with(
                 agent_ids=adaptor.agent_ids,
                 ledger_url=adaptor.ledger_url,
-                arc_client=adaptor.arc_client
+                arc_client=adaptor.arc_client,
+                ledger_client=adaptor.ledger_client,
+                cache=adaptor.cache,
+                semaphores=adaptor.semaphores,
+                cache_ttls=None
             )
             
             # Check that the tools were returned
@@ -226,4 +364,251 @@ class TestHandoffTools:
         mock_client.task.info.assert_called_once()
         
         # Check result
-        assert "The answer is 4" in result
\ No newline at end of file
+        assert "The answer is 4" in result
+    
+    @pytest.mark.asyncio
+    async def test_prefetch_handler_warms_up_on_handoff_tool_call(self):
+        """Test that a streamed handoff tool call triggers a warm-up."""
+        agent_info = AgentInfo(id="math-agent", name="Math Expert", url="")
+        tool = create_arc_handoff_tool(agent_info, AsyncMock())
+        adaptor = MagicMock()
+        adaptor.warm_up = AsyncMock()
+        handler = HandoffPrefetchHandler(adaptor, [tool])
+        
+        chunk = MagicMock()
+        chunk.message.tool_call_chunks = [{"name": "other_tool", "args": "", "index": 0}]
+        await handler.on_llm_new_token("", chunk=chunk)
+        chunk.message.tool_call_chunks = [{"name": "transfer_to_math_expert", "args": "", "index": 0}]
+        await handler.on_llm_new_token("", chunk=chunk)
+        await asyncio.sleep(0)
+        
+        adaptor.warm_up.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_create_arc_batch_tool(self):
+        """Test that the batch tool runs invocations concurrently."""
+        started = []
+        release = asyncio.Event()
+        
+        def make_tool(name):
+            tool = MagicMock()
+            tool.name = name
+            
+            async def ainvoke(args):
+                started.append(name)
+                if len(started) == 2:
+                    release.set()
+                # Both invocations must be in flight before either can finish
+                await asyncio.wait_for(release.wait(), timeout=1)
+                return f"{name} got {args['message']}"
+            
+            tool.ainvoke = ainvoke
+            return tool
+        
+        batch_tool = create_arc_batch_tool([make_tool("transfer_to_math"), make_tool("transfer_to_weather")])
+        
+        result = await batch_tool.coroutine([
+            {"tool_name": "transfer_to_math", "args": {"message": "25 * 16"}},
+            {"tool_name": "transfer_to_weather", "args": {"message": "New York"}},
+            {"tool_name": "transfer_to_unknown", "args": {}},
+        ])
+        
+        assert "transfer_to_math: transfer_to_math got 25 * 16" in result
+        assert "transfer_to_weather: transfer_to_weather got New York" in result
+        assert "Unknown tool transfer_to_unknown" in result
+
+
+class TestLLMCache:
+    """Tests for the LLMCache class."""
+    
+    def test_cache_key_is_order_independent(self):
+        """Test that cache keys do not depend on dict ordering."""
+        key1 = LLMCache.tool_key("transfer_to_math_expert", {"message": "2+2", "lang": "en"})
+        key2 = LLMCache.tool_key("transfer_to_math_expert", {"lang": "en", "message": "2+2"})
+        assert key1 == key2
+        assert key1 != LLMCache.tool_key("transfer_to_math_expert", {"message": "2+3"})
+    
+    def test_get_counts_hits_and_tokens_saved(self):
+        """Test that hits and saved tokens are counted."""
+        cache = LLMCache()
+        key = LLMCache.cache_key("gpt-4", [{"role": "user", "content": "hi"}], [], 0)
+        
+        assert cache.get(key) is None
+        cache.set(key, {"output": "hello"}, tokens=42)
+        
+        assert cache.get(key) == {"output": "hello"}
+        assert cache.cache_hits == 1
+        assert cache.tokens_saved == 42
+    
+    def test_responses_expire_and_are_evicted(self):
+        """Test TTL expiry and LRU eviction of responses."""
+        cache = LLMCache(max_responses=2, response_ttl=600)
+        
+        with patch("arc_adaptors.langchain.cache.time.monotonic", return_value=100.0):
+            cache.set("weather", "sunny", ttl=60)
+            cache.set("math", "4")
+        
+        with patch("arc_adaptors.langchain.cache.time.monotonic", return_value=160.0):
+            assert cache.get("weather") is None
+            assert cache.get("math") == "4"
+        
+        with patch("arc_adaptors.langchain.cache.time.monotonic", return_value=700.0):
+            assert cache.get("math") is None
+        
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        assert cache.get("a") is None
+        assert cache.get("c") == 3
+    
+    @pytest.mark.asyncio
+    async def test_tool_ttl_handler_tracks_shortest_ttl(self):
+        """Test that the TTLs of called handoff tools are collected."""
+        agent_info = AgentInfo(id="weather-agent", name="Weather", url="https://api.example.com/arc")
+        tool = create_arc_handoff_tool(agent_info, AsyncMock(), cache=LLMCache(), cache_ttl=300)
+        handler = ToolTTLHandler()
+        
+        await tool.ainvoke({"message": "NY"}, config={"callbacks": [handler]})
+        
+        assert handler.ttl == 300
+    
+    @pytest.mark.asyncio
+    async def test_handoff_tool_ttl_defaults_to_response_ttl(self):
+        """Test that handoff results without a configured TTL still expire."""
+        agent_info = AgentInfo(id="news-agent", name="News", url="https://api.example.com/arc")
+        tool = create_arc_handoff_tool(agent_info, AsyncMock(), cache=LLMCache(response_ttl=120))
+        handler = ToolTTLHandler()
+        
+        await tool.ainvoke({"message": "headlines"}, config={"callbacks": [handler]})
+        
+        assert handler.ttl == 120
+    
+    def test_tool_results_expire_and_are_evicted(self):
+        """Test TTL expiry and LRU eviction of tool results."""
+        cache = LLMCache(max_tool_results=2)
+        
+        with patch("arc_adaptors.langchain.cache.time.monotonic", return_value=100.0):
+            cache.set_tool_result("weather", {"message": "NY"}, "sunny", ttl=60)
+            cache.set_tool_result("math", {"message": "2+2"}, "4")
+        
+        with patch("arc_adaptors.langchain.cache.time.monotonic", return_value=159.0):
+            assert cache.get_tool_result("weather", {"message": "  NY "}) == "sunny"
+        
+        with patch("arc_adaptors.langchain.cache.time.monotonic", return_value=160.0):
+            assert cache.get_tool_result("weather", {"message": "NY"}) is None
+        
+        cache.set_tool_result("news", {"message": "tech"}, "headlines")
+        cache.set_tool_result("math", {"message": "3+3"}, "6")
+        assert cache.get_tool_result("math", {"message": "2+2"}) is None
+        assert cache.get_tool_result("news", {"message": "tech"}) == "headlines"
+    
+    @pytest.mark.asyncio
+    async def test_cached_tool(self):
+        """Test that the decorator reuses results for equivalent arguments."""
+        calls = []
+        
+        @cached_tool(ttl=60, fold_case=True)
+        async def lookup(message: str) -> str:
+            calls.append(message)
+            return message.upper()
+        
+        assert await lookup("New York") == "NEW YORK"
+        assert await lookup(message="new  york") == "NEW YORK"
+        
+        assert calls == ["New York"]
+        assert len(lookup.cache.tool_trace) == 2
+    
+    @pytest.mark.asyncio
+    async def test_handoff_tool_uses_cache(self):
+        """Test that a cached handoff result skips the ARC request."""
+        agent_info = AgentInfo(
+            id="math-agent",
+            name="Math Expert",
+            url="https://api.example.com/arc/math"
+        )
+        mock_client = AsyncMock()
+        mock_client.task.create.return_value = {
+            "result": {"type": "task", "task": {"taskId": "task-123", "status": "SUBMITTED"}}
+        }
+        mock_client.task.info.return_value = {
+            "result": {
+                "type": "task",
+                "task": {
+                    "taskId": "task-123",
+                    "status": "COMPLETED",
+                    "messages": [{"role": "agent", "parts": [{"type": "TextPart", "content": "4"}]}]
+                }
+            }
+        }
+        
+        cache = LLMCache()
+        tool = create_arc_handoff_tool(agent_info, mock_client, cache=cache)
+        
+        with patch("arc_adaptors.langchain.tools.asyncio.sleep", new=AsyncMock()):
+            assert await tool.coroutine("Calculate 2+2") == "4"
+            assert await tool.coroutine("Calculate 2+2") == "4"
+        
+        mock_client.task.create.assert_called_once()
+        assert cache.cache_hits == 1
+
+
+class TestAdaptiveSemaphore:
+    """Tests for the AdaptiveSemaphore class."""
+    
+    @pytest.mark.asyncio
+    async def test_waits_when_limit_reached(self):
+        """Test that acquire blocks until a slot is released."""
+        semaphore = AdaptiveSemaphore(initial_limit=1)
+        await semaphore.acquire()
+        
+        waiter = asyncio.ensure_future(semaphore.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        
+        semaphore.release()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert semaphore.inflight == 1
+    
+    @pytest.mark.asyncio
+    async def test_additive_increase_and_multiplicative_decrease(self):
+        """Test that the limit grows on success and halves on backpressure."""
+        semaphore = AdaptiveSemaphore(initial_limit=4)
+        
+        await semaphore.acquire()
+        semaphore.release(success=True, rtt=0.1)
+        assert semaphore.limit == 5
+        
+        # A much slower response does not grow the limit
+        await semaphore.acquire()
+        semaphore.release(success=True, rtt=1.0)
+        assert semaphore.limit == 5
+        
+        await semaphore.acquire()
+        semaphore.release(success=False)
+        assert semaphore.limit == 2.5
+        
+        for _ in range(3):
+            await semaphore.acquire()
+            semaphore.release(success=False)
+        assert semaphore.limit == 1
+    
+    def test_is_backpressure_error(self):
+        """Test classification of ARC errors."""
+        assert is_backpressure_error(RateLimitExceededError())
+        assert is_backpressure_error(asyncio.TimeoutError())
+        assert not is_backpressure_error(InvalidRequestError("bad request"))
+
+
+class TestSharedLLM:
+    """Tests for the shared LLM instances."""
+    
+    def test_get_shared_llm_is_memoized(self, monkeypatch):
+        """Test that each model gets one instance using the shared clients."""
+        pytest.importorskip("langchain_openai")
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        
+        llm = get_shared_llm("gpt-4")
+        
+        assert get_shared_llm("gpt-4") is llm
+        assert get_shared_llm("gpt-4o-mini") is not llm
+        assert llm.http_async_client is get_shared_async_client()
@@ -0,0 +1,372 @@
+"""
+Tests for the supervisor handoff example.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from typing import Any, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.tools import StructuredTool
+from pydantic import Field
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "examples"))
+
+import supervisor_handoff_example as example  # noqa: E402
+from arc_adaptors.langchain.cache import LLMCache  # noqa: E402
+from arc_adaptors.langchain.tools import AgentInfo, create_arc_handoff_tool  # noqa: E402
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that replies with a fixed sequence of messages."""
+    
+    responses: List[Any] = Field(default_factory=list)
+    calls: List[List[Any]] = Field(default_factory=list)
+    
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+    
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+    
+    def _next(self, messages: List[Any]) -> AIMessage:
+        self.calls.append(list(messages))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=self._next(messages))])
+    
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._next(messages)
+        yield ChatGenerationChunk(message=AIMessageChunk(
+            content=message.content,
+            tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                for i, call in enumerate(message.tool_calls)
+            ]
+        ))
+
+
+def tool_call(name: str, message: str, call_id: str) -> AIMessage:
+    """Create a response calling one handoff tool."""
+    return AIMessage(content="", tool_calls=[{"name": name, "args": {"message": message}, "id": call_id}])
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replace the shared LLMs of the example with a scripted model."""
+    model = ScriptedChatModel()
+    monkeypatch.setattr(example, "get_shared_llm", lambda *args, **kwargs: model)
+    monkeypatch.setattr(example, "_load_encoding", lambda model_name: None)
+    example.SupervisorAgent._bound_llms.clear()
+    return model
+
+
+@pytest.fixture
+def agent_calls():
+    """Messages received by the fake handoff tools."""
+    return []
+
+
+@pytest.fixture
+def adaptor(agent_calls):
+    """Create an adaptor stub with weather and math handoff tools."""
+    def make_tool(name: str, answer: str) -> StructuredTool:
+        async def handoff(message: str) -> str:
+            agent_calls.append((name, message))
+            return answer
+        return StructuredTool.from_function(coroutine=handoff, name=name, description=f"{name} agent")
+    
+    adaptor = MagicMock()
+    adaptor.load_tools = AsyncMock(return_value=[
+        make_tool("transfer_to_weather", "Sunny 20C"),
+        make_tool("transfer_to_math", "400"),
+    ])
+    adaptor.close = AsyncMock()
+    return adaptor
+
+
+async def routed_supervisor(adaptor: MagicMock) -> "example.SupervisorAgent":
+    """Create a supervisor whose router is stubbed."""
+    supervisor = example.SupervisorAgent(adaptor, router_threshold=0.8)
+    await supervisor.initialize()
+    supervisor._router = MagicMock()
+    supervisor._router.ainvoke = AsyncMock()
+    return supervisor
+
+
+class TestSupervisorAgent:
+    """Tests for the SupervisorAgent class."""
+    
+    @pytest.mark.asyncio
+    async def test_run_direct_feeds_tool_results_back(self, llm, adaptor, agent_calls):
+        """Test that tool calls issued one at a time all run before the answer."""
+        llm.responses = [
+            tool_call("transfer_to_weather", "NY weather", "1"),
+            tool_call("transfer_to_math", "25*16", "2"),
+            AIMessage(content="Sunny 20C in NY, and 25*16 = 400"),
+        ]
+        supervisor = example.SupervisorAgent(adaptor, router_model=None)
+        await supervisor.initialize()
+        
+        result = await supervisor._run_direct(
+            "weather in NY and 25*16",
+            supervisor._messages("weather in NY and 25*16", []),
+            {}
+        )
+        
+        assert result["output"] == "Sunny 20C in NY, and 25*16 = 400"
+        assert agent_calls == [("transfer_to_weather", "NY weather"), ("transfer_to_math", "25*16")]
+        # The last call sees both tool results
+        assert [m.content for m in llm.calls[-1] if m.type == "tool"] == ["Sunny 20C", "400"]
+    
+    @pytest.mark.asyncio
+    async def test_stream_request_matches_process_request(self, llm, adaptor):
+        """Test that streamed and regular turns take the same path."""
+        supervisor = example.SupervisorAgent(adaptor, router_model=None)
+        await supervisor.initialize()
+        
+        llm.responses = [tool_call("transfer_to_math", "2+2", "1"), AIMessage(content="It is 4")]
+        assert await supervisor.process_request("2+2") == "It is 4"
+        
+        llm.responses = [tool_call("transfer_to_math", "2+2", "1"), AIMessage(content="It is 4")]
+        chunks = [chunk async for chunk in supervisor.stream_request("2+2")]
+        assert "".join(chunks) == "It is 4"
+        assert [m.content for m in supervisor.chat_history] == ["2+2", "It is 4", "2+2", "It is 4"]
+    
+    @pytest.mark.asyncio
+    async def test_streamed_text_matches_recorded_answer(self, llm, adaptor):
+        """Test that text sent along with tool calls is part of the recorded answer."""
+        supervisor = example.SupervisorAgent(adaptor, router_model=None)
+        await supervisor.initialize()
+        
+        def responses():
+            return [
+                AIMessage(content="Let me check.", tool_calls=tool_call("transfer_to_math", "2+2", "1").tool_calls),
+                AIMessage(content="It is 4"),
+            ]
+        
+        llm.responses = responses()
+        answer = await supervisor.process_request("2+2")
+        
+        llm.responses = responses()
+        chunks = [chunk async for chunk in supervisor.stream_request("2+2")]
+        
+        assert answer == "".join(chunks) == "Let me check.\n\nIt is 4"
+        assert [m.content for m in supervisor.chat_history][1::2] == [answer, answer]
+    
+    @pytest.mark.asyncio
+    async def test_tool_errors_are_returned_to_the_llm(self, llm, adaptor, agent_calls):
+        """Test that invalid tool arguments do not abort the turn."""
+        llm.responses = [
+            AIMessage(content="", tool_calls=[{"name": "transfer_to_math", "args": {"msg": "2+2"}, "id": "1"}]),
+            tool_call("transfer_to_math", "2+2", "2"),
+            AIMessage(content="It is 4"),
+        ]
+        supervisor = example.SupervisorAgent(adaptor, router_model=None)
+        await supervisor.initialize()
+        
+        assert await supervisor.process_request("2+2") == "It is 4"
+        
+        error = next(m for m in llm.calls[1] if m.type == "tool")
+        assert error.status == "error"
+        assert error.content.startswith("Error invoking transfer_to_math")
+        assert agent_calls == [("transfer_to_math", "2+2")]
+    
+    @pytest.mark.asyncio
+    async def test_batch_rejects_non_positive_concurrency(self, llm, adaptor):
+        """Test that a batch without concurrency is rejected instead of hanging."""
+        supervisor = example.SupervisorAgent(adaptor, router_model=None)
+        with pytest.raises(ValueError):
+            await supervisor.process_requests_batch(["2+2"], max_concurrency=0)
+    
+    @pytest.mark.asyncio
+    async def test_add_to_history_summarizes_in_background(self, llm, adaptor):
+        """Test that dropped exchanges are summarized without blocking the turn."""
+        supervisor = example.SupervisorAgent(
+            adaptor, router_model=None, max_history_tokens=40, summary_refresh_turns=1
+        )
+        await supervisor.initialize()
+        llm.responses = [AIMessage(content="User asked about the weather")]
+        
+        supervisor._add_to_history("What is the weather in NY? " * 4, "Sunny 20C in New York. " * 4)
+        supervisor._add_to_history("And 25*16?", "400")
+        
+        # The history fits the budget and the summary is still being written
+        assert [m.content for m in supervisor.chat_history] == ["And 25*16?", "400"]
+        assert supervisor._summary_task is not None
+        assert supervisor._running_summary == ""
+        
+        await supervisor._summary_task
+        assert supervisor._summary_task is None
+        assert supervisor._unsummarized == []
+        assert supervisor._history()[0].content.endswith("User asked about the weather")
+    
+    @pytest.mark.asyncio
+    async def test_unsummarized_messages_stay_within_budget(self, llm, adaptor):
+        """Test that messages waiting for a failing summary model are bounded."""
+        supervisor = example.SupervisorAgent(
+            adaptor, router_model=None, max_history_tokens=40, summary_refresh_turns=1
+        )
+        await supervisor.initialize()
+        llm.responses = [RuntimeError("summary model unavailable")] * 10
+        
+        for i in range(10):
+            supervisor._add_to_history(f"Question {i}? " * 8, f"Answer {i}. " * 8)
+            if supervisor._summary_task is not None:
+                await supervisor._summary_task
+        
+        assert supervisor._running_summary == ""
+        assert len(supervisor._unsummarized) == 2
+        assert supervisor._unsummarized[0].content.startswith("Question 8?")
+        assert supervisor._unsummarized_tokens == sum(
+            supervisor._count_tokens(m) for m in supervisor._unsummarized
+        )
+        # Each retry sent the system prompt and at most one exchange
+        assert all(len(call) <= 3 for call in llm.calls)
+    
+    @pytest.mark.asyncio
+    async def test_ledger_log_is_opt_in(self, llm, adaptor):
+        """Test that exchanges are only sent to the ARC Ledger when enabled."""
+        supervisor = example.SupervisorAgent(adaptor, router_model=None)
+        supervisor._add_to_history("2+2", "4")
+        adaptor.append_to_ledger.assert_not_called()
+        
+        supervisor = example.SupervisorAgent(adaptor, router_model=None, ledger_log=True)
+        supervisor._add_to_history("2+2", "4")
+        assert adaptor.append_to_ledger.call_args.kwargs["metadata"] == {"session_id": supervisor.session_id}
+    
+    @pytest.mark.asyncio
+    async def test_turn_with_failed_handoff_is_not_cached(self, llm, adaptor):
+        """Test that an answer built from a failed handoff is not served from the cache."""
+        arc_client = MagicMock()
+        arc_client.task.create = AsyncMock(side_effect=RuntimeError("connection refused"))
+        news_tool = create_arc_handoff_tool(
+            AgentInfo(id="news-agent", name="News", url="https://news.example.com"),
+            arc_client,
+            name="transfer_to_news",
+            cache=LLMCache()
+        )
+        adaptor.load_tools = AsyncMock(return_value=[news_tool])
+        cache = LLMCache()
+        supervisor = example.SupervisorAgent(adaptor, router_model=None, cache=cache)
+        await supervisor.initialize()
+        
+        for _ in range(2):
+            llm.responses = [
+                tool_call("transfer_to_news", "headlines", "1"),
+                AIMessage(content="Sorry, the news agent is down"),
+            ]
+            assert await supervisor._run_turn("headlines?", []) == "Sorry, the news agent is down"
+        
+        assert arc_client.task.create.await_count == 2
+        assert cache.cache_hits == 0
+    
+    @pytest.mark.asyncio
+    async def test_batch_overlaps_requests_in_input_order(self, llm, adaptor, monkeypatch):
+        """Test that batched requests run concurrently and return in input order."""
+        supervisor = example.SupervisorAgent(adaptor, router_model=None)
+        await supervisor.initialize()
+        inflight: List[str] = []
+        peak: List[int] = []
+        
+        async def run_turn(user_input, chat_history):
+            inflight.append(user_input)
+            peak.append(len(inflight))
+            # Later inputs finish first
+            await asyncio.sleep(0.01 * (6 - int(user_input)))
+            inflight.remove(user_input)
+            return f"answer {user_input}"
+        
+        monkeypatch.setattr(supervisor, "_run_turn", run_turn)
+        
+        results = await supervisor.process_requests_batch([str(i) for i in range(6)], max_concurrency=2)
+        
+        assert results == [f"answer {i}" for i in range(6)]
+        assert max(peak) == 2
+    
+    @pytest.mark.asyncio
+    async def test_batch_returns_failures_in_place(self, llm, adaptor, monkeypatch):
+        """Test that a failed request does not discard the other results."""
+        supervisor = example.SupervisorAgent(adaptor, router_model=None)
+        await supervisor.initialize()
+        
+        async def run_turn(user_input, chat_history):
+            if user_input == "fail":
+                raise RuntimeError("rate limited")
+            await asyncio.sleep(0.01)
+            return f"answer {user_input}"
+        
+        monkeypatch.setattr(supervisor, "_run_turn", run_turn)
+        
+        results = await supervisor.process_requests_batch(["a", "fail", "b"])
+        
+        assert results[0] == "answer a"
+        assert isinstance(results[1], RuntimeError)
+        assert results[2] == "answer b"
+    
+    @pytest.mark.asyncio
+    async def test_batch_does_not_share_or_change_history(self, llm, adaptor, monkeypatch):
+        """Test that each batched request gets its own copy of the history."""
+        supervisor = example.SupervisorAgent(adaptor, router_model=None)
+        await supervisor.initialize()
+        supervisor._add_to_history("hi", "hello")
+        histories = []
+        
+        async def run_turn(user_input, chat_history):
+            histories.append(chat_history)
+            chat_history.append(user_input)
+            return user_input
+        
+        monkeypatch.setattr(supervisor, "_run_turn", run_turn)
+        
+        await supervisor.process_requests_batch(["a", "b"])
+        
+        assert histories[0] is not histories[1]
+        assert [m.content for m in histories[0][:2]] == ["hi", "hello"]
+        assert [m.content for m in supervisor.chat_history] == ["hi", "hello"]
+
+
+class TestRouter:
+    """Tests for the router fast path of the SupervisorAgent class."""
+    
+    @pytest.mark.asyncio
+    async def test_confident_route_skips_agent_loop(self, llm, adaptor, agent_calls):
+        """Test that a confident decision hands off directly."""
+        supervisor = await routed_supervisor(adaptor)
+        supervisor._router.ainvoke.return_value = example.RouteDecision(
+            agent="transfer_to_weather", message="weather in NY", confidence=0.9
+        )
+        
+        assert await supervisor.process_request("weather in NY?") == "Sunny 20C"
+        assert agent_calls == [("transfer_to_weather", "weather in NY")]
+        assert llm.calls == []
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("decision", [
+        example.RouteDecision(agent="transfer_to_weather", message="weather in NY", confidence=0.5),
+        example.RouteDecision(agent="transfer_to_stocks", message="weather in NY", confidence=0.9),
+        RuntimeError("router unavailable"),
+    ], ids=["below_threshold", "unknown_tool", "router_error"])
+    async def test_falls_back_to_agent_loop(self, llm, adaptor, agent_calls, decision):
+        """Test that unusable decisions run the full agent instead."""
+        supervisor = await routed_supervisor(adaptor)
+        if isinstance(decision, Exception):
+            supervisor._router.ainvoke.side_effect = decision
+        else:
+            supervisor._router.ainvoke.return_value = decision
+        llm.responses = [tool_call("transfer_to_weather", "NY weather", "1"), AIMessage(content="Sunny")]
+        
+        assert await supervisor.process_request("weather in NY?") == "Sunny"
+        assert agent_calls == [("transfer_to_weather", "NY weather")]
+        assert len(llm.calls) == 2